@@ -0,0 +1,179 @@
+# loadtest.py
+#
+# Load generator for metacog_app. Drives POST /chat either open-loop at a
+# fixed arrival rate (--rps) or closed-loop with a fixed number of
+# concurrent clients (--concurrency), then reports throughput and
+# p50/p95/p99 latency end to end and per upstream phase (π, φ, e,
+# reflection, from each response's state.upstream_calls).
+#
+# Typical capacity run against the local mock upstream:
+#   python mock_upstream.py --port 9000 --latency lognormal:400,0.6 &
+#   UPSTREAM_PROVIDER=openai OPENAI_API_KEY=mock OPENAI_BASE_URL=http://127.0.0.1:9000/v1 \
+#       python -m uvicorn metacog_app:app --port 8080 &
+#   python loadtest.py --url http://127.0.0.1:8080 --rps 50 --duration 60
+#   python loadtest.py --url http://127.0.0.1:8080 --concurrency 64 --requests 2000 --json
+
+from __future__ import annotations
+import json, math, time, asyncio, argparse, itertools
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+DEFAULT_PROMPTS = [
+    "Hello",
+    "Summarize the trade-offs of caching upstream responses.",
+    "What should we check before each release?",
+    "Explain coherence in one paragraph.",
+]
+
+# --- Stats -------------------------------------------------------------------
+def percentile(sorted_vals: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence (0.0 if empty)."""
+    if not sorted_vals:
+        return 0.0
+    rank = math.ceil(p / 100.0 * len(sorted_vals))
+    return sorted_vals[min(len(sorted_vals), max(1, rank)) - 1]
+
+def _dist(vals: List[float]) -> Dict[str, float]:
+    vals = sorted(vals)
+    return {
+        "count": len(vals),
+        "mean": round(sum(vals) / len(vals), 2) if vals else 0.0,
+        "p50": round(percentile(vals, 50), 2),
+        "p95": round(percentile(vals, 95), 2),
+        "p99": round(percentile(vals, 99), 2),
+        "max": round(vals[-1], 2) if vals else 0.0,
+    }
+
+def summarize(results: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    """Fold per-request results ({ok, ms, status, calls}) into a report."""
+    ok = [r for r in results if r["ok"]]
+    phases: Dict[str, List[float]] = {}
+    for r in ok:
+        for call in r["calls"]:
+            if call.get("cache") != "hit":
+                phases.setdefault(call["phase"], []).append(call["ms"])
+    statuses: Dict[str, int] = {}
+    for r in results:
+        if not r["ok"]:
+            statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+    return {
+        "requests": len(results),
+        "ok": len(ok),
+        "errors": len(results) - len(ok),
+        "error_status": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": _dist([r["ms"] for r in ok]),
+        "phases_ms": {phase: _dist(v) for phase, v in sorted(phases.items())},
+    }
+
+# --- Driver ------------------------------------------------------------------
+async def _one(client: httpx.AsyncClient, i: int, prompts: Sequence[str],
+               sessions: int, results: List[Dict[str, Any]]):
+    body: Dict[str, Any] = {"messages": [{"role": "user", "content": prompts[i % len(prompts)]}]}
+    if sessions:
+        body["session_id"] = f"load-{i % sessions}"
+    t0 = time.perf_counter()
+    try:
+        r = await client.post("/chat", json=body)
+        ms = 1000 * (time.perf_counter() - t0)
+        if r.status_code == 200:
+            calls = r.json().get("state", {}).get("upstream_calls", [])
+            results.append({"ok": True, "ms": ms, "status": 200, "calls": calls})
+        else:
+            results.append({"ok": False, "ms": ms, "status": r.status_code, "calls": []})
+    except httpx.HTTPError as exc:
+        results.append({"ok": False, "ms": 1000 * (time.perf_counter() - t0),
+                        "status": type(exc).__name__, "calls": []})
+
+async def run_load(url: str, *, rps: Optional[float] = None, concurrency: Optional[int] = None,
+                   duration: Optional[float] = None, requests: Optional[int] = None,
+                   prompts: Sequence[str] = DEFAULT_PROMPTS, sessions: int = 0,
+                   timeout: float = 120.0, transport: Optional[httpx.AsyncBaseTransport] = None,
+                   ) -> Dict[str, Any]:
+    """
+    Open-loop when `rps` is given (arrivals on a fixed schedule, however slow
+    the server gets), closed-loop with `concurrency` clients otherwise. Stops
+    after `requests` requests or `duration` seconds, whichever comes first.
+    `sessions` > 0 spreads requests over that many reused session ids so
+    context grows as in real traffic; 0 gives every request a fresh session.
+    """
+    if requests is None and duration is None:
+        raise ValueError("set requests and/or duration")
+    if rps is None and not concurrency:
+        raise ValueError("set rps or concurrency")
+    limit = requests if requests is not None else float("inf")
+    deadline = time.perf_counter() + duration if duration is not None else float("inf")
+    results: List[Dict[str, Any]] = []
+    pool = httpx.Limits(max_connections=None if rps else concurrency, max_keepalive_connections=None)
+
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=pool, transport=transport) as client:
+        t0 = time.perf_counter()
+        if rps:
+            tasks: List[asyncio.Task] = []
+            i = 0
+            while i < limit:
+                due = t0 + i / rps
+                if due >= deadline:
+                    break
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(_one(client, i, prompts, sessions, results)))
+                i += 1
+            await asyncio.gather(*tasks)
+        else:
+            counter = iter(range(requests)) if requests is not None else itertools.count()
+            async def worker():
+                for i in counter:
+                    if time.perf_counter() >= deadline:
+                        return
+                    await _one(client, i, prompts, sessions, results)
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+
+    report = summarize(results, elapsed)
+    report["mode"] = {"rps": rps} if rps else {"concurrency": concurrency}
+    return report
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"mode {report['mode']}  requests {report['requests']}  ok {report['ok']}  "
+        f"errors {report['errors']} {report['error_status'] or ''}".rstrip(),
+        f"elapsed {report['elapsed_s']}s  throughput {report['throughput_rps']} req/s",
+        f"{'':<12}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)",
+    ]
+    rows = [("total", report["latency_ms"])] + list(report["phases_ms"].items())
+    for name, d in rows:
+        lines.append(f"{name:<12}{d['count']:>8}{d['p50']:>10}{d['p95']:>10}{d['p99']:>10}{d['max']:>10}")
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Load-test the metacog proxy's /chat endpoint.")
+    ap.add_argument("--url", default="http://127.0.0.1:8080")
+    mode = ap.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--rps", type=float, help="open-loop arrival rate")
+    mode.add_argument("--concurrency", type=int, help="closed-loop client count")
+    ap.add_argument("--duration", type=float, help="seconds to run")
+    ap.add_argument("--requests", type=int, help="total requests to send")
+    ap.add_argument("--prompts", help="file with one prompt per line")
+    ap.add_argument("--sessions", type=int, default=0, help="reuse this many session ids (0 = fresh each)")
+    ap.add_argument("--timeout", type=float, default=120.0)
+    ap.add_argument("--json", action="store_true", help="print the raw report as JSON")
+    args = ap.parse_args(argv)
+    if args.duration is None and args.requests is None:
+        ap.error("give --duration and/or --requests")
+
+    prompts = DEFAULT_PROMPTS
+    if args.prompts:
+        with open(args.prompts, encoding="utf-8") as f:
+            prompts = [line.strip() for line in f if line.strip()] or DEFAULT_PROMPTS
+
+    report = asyncio.run(run_load(args.url, rps=args.rps, concurrency=args.concurrency,
+                                  duration=args.duration, requests=args.requests, prompts=prompts,
+                                  sessions=args.sessions, timeout=args.timeout))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+if __name__ == "__main__":
+    main()
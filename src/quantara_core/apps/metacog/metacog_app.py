@@ -7,18 +7,48 @@
 #   pip install fastapi uvicorn httpx pydantic
 #   export UPSTREAM_PROVIDER=openai   # or "echo" for a no-external baseline
 #   export OPENAI_API_KEY=sk-...      # if using openai
+#   export OPENAI_BASE_URL=http://127.0.0.1:9000/v1   # optional; any OpenAI-compatible server
 #   python -m uvicorn metacog_app:app --host 0.0.0.0 --port 8080
 #
 # Use:
 #   POST /chat { "messages":[{"role":"user","content":"Hello"}] }
+#   POST /chat/stream  (same body; server-sent events: e-phase tokens, then a final "done" event)
+#   POST /chat/batch { "requests":[<chat body>, ...], "concurrency": 8 }  (NDJSON, one line per finished chat)
+#   GET  /metrics  (Prometheus text: per-stage latency, upstream calls/errors, coherence, in-flight)
 #   Optional config: { "policy": {...}, "metadata": {...} }
+#
+# Upstream HTTP pool (one keep-alive client per process):
+#   UPSTREAM_TIMEOUT=60  UPSTREAM_MAX_CONNECTIONS=100
+#   UPSTREAM_MAX_KEEPALIVE=20  UPSTREAM_KEEPALIVE_EXPIRY=30
+#
+# Optional π/φ response cache (off unless PHASE_CACHE is set):
+#   PHASE_CACHE=memory|disk  PHASE_CACHE_TTL=600  PHASE_CACHE_SIZE=2048
+#   PHASE_CACHE_PATH=.metacog_phase_cache.sqlite3   (disk tier)
+#   PHASE_CACHE_PURGE_EVERY=256   (expired disk rows are deleted every N puts)
+#
+# Upstream rate limit (token bucket per provider; off when UPSTREAM_RPS=0):
+#   UPSTREAM_RPS=0  UPSTREAM_BURST=10  BATCH_CONCURRENCY=8
+#   BATCH_CONCURRENCY_MAX=64   (server-side ceiling for a request's "concurrency")
+#
+# Identical in-flight upstream calls (same prompt + sampling params) share one
+# request; disable with UPSTREAM_COALESCE=0.
+#
+# Capacity testing: mock_upstream.py is a local OpenAI-compatible stand-in
+# (point OPENAI_BASE_URL at it) and loadtest.py drives /chat and reports
+# throughput plus p50/p95/p99 latency per phase.
 
 from __future__ import annotations
-import os, time, uuid, json, math
-from typing import List, Dict, Any, Optional, Literal, Tuple
+import os, time, uuid, json, math, asyncio, hashlib, sqlite3, threading
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import List, Dict, Any, Optional, Literal, Tuple, AsyncIterator, Iterable
 from dataclasses import dataclass
 
 from fastapi import FastAPI, Body
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 import httpx
 
@@ -39,26 +69,210 @@ except Exception:
         punct = sum(1 for c in text if c in ".?!,;:")
         return max(0.05, min(1.0, 0.35 + 0.15*math.tanh((punct+caps)/tokens)))
 
-# --- In-memory store (swap with Redis/DB in prod) ---------------------------
-class Memory:
+# --- Session stores ---------------------------------------------------------
+# SESSION_STORE=memory   unbounded dict (default, original behaviour)
+#               bounded  LRU + idle-TTL eviction, capped messages per session
+#                        (SESSION_MAX=10000, SESSION_TTL=3600, SESSION_MAX_MESSAGES=200)
+#               sqlite   local SQLite file, messages appended incrementally
+#                        (SESSION_DB=metacog_sessions.sqlite3, SESSION_MAX_MESSAGES loaded per get)
+class SessionStore:
+    """
+    Interface: a session is {"messages": [...], "stats": {...}, "created": ts,
+    "offset": n}, where offset counts older messages the store has trimmed, so
+    messages[i] is turn number offset + i of the whole conversation.
+    """
+    # True when calls do blocking I/O; async handlers then run them in a worker thread
+    blocking = False
+    def get(self, sid: str) -> Dict[str, Any]:
+        raise NotImplementedError
+    def set(self, sid: str, data: Dict[str, Any]):
+        raise NotImplementedError
+    def append_messages(self, sid: str, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Append to a session's history and return the (updated) session."""
+        raise NotImplementedError
+    def update_stats(self, sid: str, stats: Dict[str, Any]):
+        raise NotImplementedError
+
+def _new_session() -> Dict[str, Any]:
+    return {"messages": [], "stats": {}, "created": time.time(), "offset": 0}
+
+def _trim(ses: Dict[str, Any], max_messages: int):
+    dropped = len(ses["messages"]) - max_messages
+    if dropped > 0:
+        del ses["messages"][:dropped]
+        ses["offset"] = ses.get("offset", 0) + dropped
+
+class Memory(SessionStore):
     def __init__(self):
         self.sessions: Dict[str, Dict[str, Any]] = {}
     def get(self, sid: str) -> Dict[str, Any]:
-        return self.sessions.setdefault(sid, {"messages": [], "stats": {}, "created": time.time()})
+        return self.sessions.setdefault(sid, _new_session())
     def set(self, sid: str, data: Dict[str, Any]):
         self.sessions[sid] = data
+    def append_messages(self, sid: str, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        ses = self.get(sid)
+        ses["messages"].extend(messages)
+        return ses
+    def update_stats(self, sid: str, stats: Dict[str, Any]):
+        self.get(sid)["stats"].update(stats)
+
+class BoundedMemory(Memory):
+    """In-memory store that evicts least-recently-used and idle sessions."""
+    def __init__(self, max_sessions: int = 10000, idle_ttl: float = 3600.0, max_messages: int = 200):
+        self.sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.last_seen: Dict[str, float] = {}
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_messages = max_messages
+        self.lock = threading.Lock()  # sync routes run in FastAPI's threadpool
+    def _touch(self, sid: str):
+        # caller holds self.lock
+        now = time.time()
+        self.sessions.move_to_end(sid)
+        self.last_seen[sid] = now
+        # oldest entries sit at the front: evict while over capacity or idle too long
+        while self.sessions:
+            oldest = next(iter(self.sessions))
+            if oldest != sid and (len(self.sessions) > self.max_sessions
+                                  or now - self.last_seen[oldest] > self.idle_ttl):
+                del self.sessions[oldest]
+                del self.last_seen[oldest]
+            else:
+                break
+    def _get(self, sid: str) -> Dict[str, Any]:
+        ses = self.sessions.get(sid)
+        if ses is not None and time.time() - self.last_seen[sid] > self.idle_ttl:
+            ses = None  # expired
+        if ses is None:
+            ses = self.sessions[sid] = _new_session()
+        self._touch(sid)
+        return ses
+    def get(self, sid: str) -> Dict[str, Any]:
+        with self.lock:
+            return self._get(sid)
+    def set(self, sid: str, data: Dict[str, Any]):
+        with self.lock:
+            self.sessions[sid] = data
+            _trim(data, self.max_messages)
+            self._touch(sid)
+    def append_messages(self, sid: str, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        with self.lock:
+            ses = self._get(sid)
+            ses["messages"].extend(messages)
+            _trim(ses, self.max_messages)
+            return ses
+    def update_stats(self, sid: str, stats: Dict[str, Any]):
+        with self.lock:
+            self._get(sid)["stats"].update(stats)
+
+class SQLiteMemory(SessionStore):
+    """Persistent store; new messages are INSERTed, never rewritten with the whole session."""
+    blocking = True
+    def __init__(self, path: str = "metacog_sessions.sqlite3", max_messages: int = 200):
+        self.max_messages = max_messages
+        self.lock = threading.Lock()  # sync routes run in FastAPI's threadpool
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS sessions (sid TEXT PRIMARY KEY, created REAL, stats TEXT)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS messages (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                        "sid TEXT, role TEXT, content TEXT)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS messages_sid ON messages (sid, id)")
+        self.db.commit()
+    def _ensure(self, sid: str) -> Tuple[float, Dict[str, Any]]:
+        row = self.db.execute("SELECT created, stats FROM sessions WHERE sid=?", (sid,)).fetchone()
+        if row:
+            return row[0], json.loads(row[1])
+        created = time.time()
+        self.db.execute("INSERT INTO sessions VALUES (?,?,?)", (sid, created, "{}"))
+        self.db.commit()
+        return created, {}
+    def get(self, sid: str) -> Dict[str, Any]:
+        with self.lock:
+            created, stats = self._ensure(sid)
+            rows = self.db.execute("SELECT role, content FROM messages WHERE sid=? ORDER BY id DESC LIMIT ?",
+                                   (sid, self.max_messages)).fetchall()
+            total = self.db.execute("SELECT COUNT(*) FROM messages WHERE sid=?", (sid,)).fetchone()[0]
+        return {"messages": [{"role": r, "content": c} for r, c in reversed(rows)],
+                "stats": stats, "created": created, "offset": total - len(rows)}
+    def set(self, sid: str, data: Dict[str, Any]):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO sessions VALUES (?,?,?)",
+                            (sid, data.get("created", time.time()), json.dumps(data.get("stats", {}))))
+            self.db.execute("DELETE FROM messages WHERE sid=?", (sid,))
+            self.db.executemany("INSERT INTO messages (sid, role, content) VALUES (?,?,?)",
+                                [(sid, m["role"], m["content"]) for m in data.get("messages", [])])
+            self.db.commit()
+    def append_messages(self, sid: str, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        with self.lock:
+            self._ensure(sid)
+            self.db.executemany("INSERT INTO messages (sid, role, content) VALUES (?,?,?)",
+                                [(sid, m["role"], m["content"]) for m in messages])
+            self.db.commit()
+        return self.get(sid)
+    def update_stats(self, sid: str, stats: Dict[str, Any]):
+        with self.lock:
+            _, current = self._ensure(sid)
+            current.update(stats)
+            self.db.execute("UPDATE sessions SET stats=? WHERE sid=?", (json.dumps(current), sid))
+            self.db.commit()
+
+def make_store() -> SessionStore:
+    kind = os.getenv("SESSION_STORE", "memory").lower()
+    max_messages = int(os.getenv("SESSION_MAX_MESSAGES", "200"))
+    if kind == "bounded":
+        return BoundedMemory(max_sessions=int(os.getenv("SESSION_MAX", "10000")),
+                             idle_ttl=float(os.getenv("SESSION_TTL", "3600")),
+                             max_messages=max_messages)
+    if kind == "sqlite":
+        return SQLiteMemory(os.getenv("SESSION_DB", "metacog_sessions.sqlite3"), max_messages=max_messages)
+    return Memory()
+
+MEM = make_store()
 
-MEM = Memory()
+# --- Shared upstream HTTP client --------------------------------------------
+class UpstreamHTTP:
+    """One long-lived httpx.AsyncClient per process, reused by every adapter call."""
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+    def client(self) -> httpx.AsyncClient:
+        # created lazily too, so adapters also work outside the FastAPI lifecycle
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=float(os.getenv("UPSTREAM_TIMEOUT", "60")),
+                limits=httpx.Limits(
+                    max_connections=int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100")),
+                    max_keepalive_connections=int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20")),
+                    keepalive_expiry=float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30")),
+                ),
+            )
+        return self._client
+    async def start(self):
+        self.client()
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+HTTP = UpstreamHTTP()
 
 # --- Upstream adapter interface --------------------------------------------
 class UpstreamAdapter:
     async def complete(self, messages: List[Dict[str, str]], **kw) -> str:
         raise NotImplementedError
+    async def stream(self, messages: List[Dict[str, str]], **kw) -> AsyncIterator[str]:
+        # default: no native streaming, deliver the whole completion as one chunk
+        yield await self.complete(messages, **kw)
 
 class EchoAdapter(UpstreamAdapter):
     async def complete(self, messages: List[Dict[str, str]], **kw) -> str:
         last = next((m["content"] for m in reversed(messages) if m["role"]=="user"), "")
         return f"(echo) You said: {last}"
+    async def stream(self, messages: List[Dict[str, str]], **kw) -> AsyncIterator[str]:
+        # simulate token streaming: one word per chunk, yielding to the loop in between
+        text = await self.complete(messages, **kw)
+        for i, word in enumerate(text.split(" ")):
+            await asyncio.sleep(0)
+            yield word if i == 0 else " " + word
 
 class OpenAIAdapter(UpstreamAdapter):
     def __init__(self, model: str = None):
@@ -66,8 +280,9 @@ class OpenAIAdapter(UpstreamAdapter):
         self.key = os.getenv("OPENAI_API_KEY","")
         if not self.key:
             raise RuntimeError("OPENAI_API_KEY not set")
-    async def complete(self, messages: List[Dict[str, str]], **kw) -> str:
-        url = "https://api.openai.com/v1/chat/completions"
+        base = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+        self.url = base.rstrip("/") + "/chat/completions"
+    def _request(self, messages: List[Dict[str, str]], **kw) -> Tuple[Dict[str, str], Dict[str, Any]]:
         headers = {"Authorization": f"Bearer {self.key}", "Content-Type":"application/json"}
         payload = {
             "model": self.model,
@@ -75,11 +290,27 @@ class OpenAIAdapter(UpstreamAdapter):
             "temperature": kw.get("temperature", 0.4),
             "max_tokens": kw.get("max_tokens", 600),
         }
-        async with httpx.AsyncClient(timeout=60) as client:
-            r = await client.post(url, headers=headers, json=payload)
+        return headers, payload
+    async def complete(self, messages: List[Dict[str, str]], **kw) -> str:
+        headers, payload = self._request(messages, **kw)
+        r = await HTTP.client().post(self.url, headers=headers, json=payload)
+        r.raise_for_status()
+        data = r.json()
+        return data["choices"][0]["message"]["content"]
+    async def stream(self, messages: List[Dict[str, str]], **kw) -> AsyncIterator[str]:
+        headers, payload = self._request(messages, **kw)
+        payload["stream"] = True
+        async with HTTP.client().stream("POST", self.url, headers=headers, json=payload) as r:
             r.raise_for_status()
-            data = r.json()
-            return data["choices"][0]["message"]["content"]
+            async for line in r.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
 
 def make_adapter() -> UpstreamAdapter:
     provider = os.getenv("UPSTREAM_PROVIDER", "echo").lower()
@@ -89,6 +320,261 @@ def make_adapter() -> UpstreamAdapter:
 
 ADAPTER = make_adapter()
 
+# --- Metrics ----------------------------------------------------------------
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+_UNIT_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8)
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Metrics:
+    """
+    In-process Prometheus-style registry. The request path only does O(1)
+    dict lookups and integer increments; formatting happens at scrape time.
+    """
+    KINDS = {
+        "metacog_stage_seconds": ("histogram", "Latency of each pi_phi_e stage.", _LATENCY_BUCKETS),
+        "metacog_request_seconds": ("histogram", "End-to-end pi_phi_e latency.", _LATENCY_BUCKETS),
+        "metacog_upstream_seconds": ("histogram", "Upstream adapter call latency (cache hits and coalesced waits excluded).", _LATENCY_BUCKETS),
+        "metacog_upstream_coalesced_total": ("counter", "Upstream calls served by joining an identical in-flight call.", None),
+        "metacog_coherence": ("histogram", "Final coherence score per request.", _UNIT_BUCKETS),
+        "metacog_reflections": ("histogram", "Reflection rewrites per request.", _COUNT_BUCKETS),
+        "metacog_upstream_errors_total": ("counter", "Upstream adapter calls that raised.", None),
+        "metacog_in_flight": ("gauge", "pi_phi_e pipelines currently running.", None),
+    }
+    def __init__(self):
+        self.series: Dict[str, Dict[Tuple[Tuple[str, str], ...], Any]] = {name: {} for name in self.KINDS}
+    def observe(self, name: str, value: float, **labels: str):
+        key = tuple(sorted(labels.items()))
+        h = self.series[name].get(key)
+        if h is None:
+            h = self.series[name][key] = Histogram(self.KINDS[name][2])
+        h.observe(value)
+    def inc(self, name: str, value: float = 1.0, **labels: str):
+        key = tuple(sorted(labels.items()))
+        series = self.series[name]
+        series[key] = series.get(key, 0.0) + value
+    @contextmanager
+    def timer(self, name: str, **labels: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0, **labels)
+    @staticmethod
+    def _labels(key: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+        parts = [f'{k}="{v}"' for k, v in key] + ([extra] if extra else [])
+        return "{" + ",".join(parts) + "}" if parts else ""
+    def render(self) -> str:
+        out: List[str] = []
+        for name, (kind, help_text, _) in self.KINDS.items():
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            for key, val in list(self.series[name].items()):
+                if kind != "histogram":
+                    out.append(f"{name}{self._labels(key)} {val}")
+                    continue
+                cumulative = 0
+                for bound, n in zip(val.bounds + (float("inf"),), val.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    le_label = f'le="{le}"'
+                    out.append(f"{name}_bucket{self._labels(key, le_label)} {cumulative}")
+                out.append(f"{name}_sum{self._labels(key)} {val.sum}")
+                out.append(f"{name}_count{self._labels(key)} {val.count}")
+        return "\n".join(out) + "\n"
+
+METRICS = Metrics()
+
+# --- Upstream rate limiting -------------------------------------------------
+class TokenBucket:
+    """Async token bucket: `rate` calls/s on average, bursts of up to `burst`."""
+    def __init__(self, rate: float, burst: int = 10):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    async def acquire(self):
+        async with self.lock:  # FIFO: waiters are served in arrival order
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+RATE_LIMITS: Dict[str, TokenBucket] = {}
+
+async def _rate_limit():
+    rate = float(os.getenv("UPSTREAM_RPS", "0"))
+    if rate <= 0:
+        return
+    provider = os.getenv("UPSTREAM_PROVIDER", "echo").lower()
+    bucket = RATE_LIMITS.get(provider)
+    if bucket is None:
+        bucket = RATE_LIMITS[provider] = TokenBucket(rate, int(os.getenv("UPSTREAM_BURST", "10")))
+    await bucket.acquire()
+
+# --- Phase response cache ---------------------------------------------------
+class PhaseCache:
+    """
+    TTL + size-bounded LRU for π/φ completions, keyed by a hash of the prompt
+    messages and sampling parameters. An optional SQLite file backs the
+    in-process tier so warm entries survive restarts and are shared locally.
+    Expired disk rows are purged every `purge_every` puts (reads already
+    ignore them), through an index on `expires`.
+
+    get/put are coroutines: the memory tier is checked inline on the event
+    loop, and only disk-tier SELECTs and INSERT+commit hop to a worker
+    thread, serialised by `lock` on the shared connection.
+    """
+    def __init__(self, ttl: float = 600.0, max_entries: int = 2048, path: Optional[str] = None,
+                 purge_every: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.purge_every = max(1, purge_every)
+        self._puts = 0
+        self.entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()  # disk I/O runs in asyncio.to_thread workers
+        self.db: Optional[sqlite3.Connection] = None
+        if path:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute("CREATE TABLE IF NOT EXISTS phase_cache (key TEXT PRIMARY KEY, value TEXT, expires REAL)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS phase_cache_expires ON phase_cache (expires)")
+            self.db.commit()
+
+    @staticmethod
+    def key(messages: List[Dict[str, str]], **kw) -> str:
+        blob = json.dumps({"provider": os.getenv("UPSTREAM_PROVIDER", "echo"),
+                           "model": getattr(ADAPTER, "model", None),
+                           "messages": messages, "params": kw}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        hit = self.entries.get(key)
+        if hit is not None and hit[0] < now:
+            del self.entries[key]
+            hit = None
+        if hit is None and self.db is not None:
+            row = await asyncio.to_thread(self._disk_get, key)
+            if row and row[1] >= now:
+                hit = (row[1], row[0])
+                self._remember(key, hit)
+        if hit is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return hit[1]
+
+    async def put(self, key: str, value: str):
+        expires = time.time() + self.ttl
+        self._remember(key, (expires, value))
+        if self.db is not None:
+            await asyncio.to_thread(self._disk_put, key, value, expires)
+
+    def purge(self) -> int:
+        """Delete expired disk rows (index range scan); returns how many went."""
+        if self.db is None:
+            return 0
+        with self.lock:
+            n = self._purge()
+            self.db.commit()
+        return n
+
+    def _disk_get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self.lock:
+            return self.db.execute("SELECT value, expires FROM phase_cache WHERE key=?", (key,)).fetchone()
+
+    def _disk_put(self, key: str, value: str, expires: float):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO phase_cache VALUES (?,?,?)", (key, value, expires))
+            self._puts += 1
+            if self._puts % self.purge_every == 0:
+                self._purge()
+            self.db.commit()
+
+    def _purge(self) -> int:
+        return self.db.execute("DELETE FROM phase_cache WHERE expires < ?", (time.time(),)).rowcount
+
+    def _remember(self, key: str, entry: Tuple[float, str]):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+def make_phase_cache() -> Optional[PhaseCache]:
+    mode = os.getenv("PHASE_CACHE", "").lower()
+    if mode not in ("memory", "disk"):
+        return None
+    return PhaseCache(ttl=float(os.getenv("PHASE_CACHE_TTL", "600")),
+                      max_entries=int(os.getenv("PHASE_CACHE_SIZE", "2048")),
+                      path=os.getenv("PHASE_CACHE_PATH", ".metacog_phase_cache.sqlite3") if mode == "disk" else None,
+                      purge_every=int(os.getenv("PHASE_CACHE_PURGE_EVERY", "256")))
+
+PHASE_CACHE = make_phase_cache()
+
+# --- Upstream request coalescing ---------------------------------------------
+class SingleFlight:
+    """
+    Single-flight for identical concurrent upstream calls. The first caller
+    for a key runs the call in its own task; callers arriving while it is in
+    flight await that same task. Each waiter awaits through asyncio.shield,
+    so one waiter's cancellation (client disconnect, best-of-N early exit)
+    never cancels the call for the others; the shared task is cancelled only
+    once nobody is left waiting on it.
+    """
+    def __init__(self):
+        self.flights: Dict[str, List[Any]] = {}  # key -> [task, waiters]
+        self.leaders = 0
+        self.joined = 0
+
+    async def do(self, key: str, fn) -> Tuple[Any, bool]:
+        """Return (result of fn(), joined) where joined means another caller's flight was reused."""
+        flight = self.flights.get(key)
+        joined = flight is not None and not flight[0].done()
+        if joined:
+            self.joined += 1
+        else:
+            self.leaders += 1
+            flight = self.flights[key] = [asyncio.ensure_future(fn()), 0]
+            flight[0].add_done_callback(lambda _t, k=key, f=flight: self._land(k, f))
+        flight[1] += 1
+        try:
+            return await asyncio.shield(flight[0]), joined
+        finally:
+            flight[1] -= 1
+            if flight[1] == 0 and not flight[0].done():
+                # unregister before cancelling: a caller arriving before the
+                # task has unwound must start a fresh flight, not join this one
+                if self.flights.get(key) is flight:
+                    del self.flights[key]
+                flight[0].cancel()
+
+    def _land(self, key: str, flight: List[Any]):
+        if self.flights.get(key) is flight:
+            del self.flights[key]
+        if not flight[0].cancelled():
+            flight[0].exception()  # mark retrieved; waiters have already seen it
+
+COALESCE = SingleFlight() if os.getenv("UPSTREAM_COALESCE", "1") != "0" else None
+
 # --- Policies / scoring -----------------------------------------------------
 @dataclass
 class Policy:
@@ -98,9 +584,78 @@ class Policy:
     target_coherence: float = 0.65
     temperature: float = 0.4
     max_tokens: int = 700
+    # "sequential": critique loop, one rewrite at a time (up to max_reflections)
+    # "best_of_n": min(reflection_candidates, max_reflections) concurrent rewrites,
+    #              keep the best-scoring one; max_reflections caps upstream rewrites
+    #              per request in both modes, so 0 disables reflection entirely
+    reflection_mode: str = "sequential"
+    reflection_candidates: int = 3
+    # approximate token budget for the verbatim history window sent to φ and e
+    context_tokens: int = 1500
 
 DEFAULT_POLICY = Policy()
 
+# --- Context builder --------------------------------------------------------
+def _approx_tokens(text: str) -> int:
+    # ~4 chars/token; good enough to bound prompt size without a tokenizer
+    return len(text) // 4 + 1
+
+class ContextBuilder:
+    """
+    Token-budgeted history for the φ/e prompts.
+
+    The newest turns are sent verbatim up to policy.context_tokens; turns that
+    fall out of that window are compacted once into a rolling extractive
+    summary (capped at summary_tokens) kept in the session's context state and
+    reused on every later request, so each request only summarizes the turns
+    newly evicted since the last one. Progress is tracked by absolute turn
+    number (state["summarized"]), so repeated identical turns cannot confuse it;
+    `offset` is the session's trim offset (turns the store already dropped).
+    """
+    def __init__(self, summary_tokens: int = 300, line_chars: int = 160):
+        self.summary_tokens = summary_tokens
+        self.line_chars = line_chars
+
+    def _summary_line(self, m: Dict[str, str]) -> str:
+        text = " ".join(m["content"].split())
+        first = text.split(". ")[0]
+        if len(first) > self.line_chars:
+            first = first[:self.line_chars - 1] + "…"
+        return f"- {m['role']}: {first}"
+
+    def build(self, messages: List[Dict[str, str]], budget_tokens: int, state: Dict[str, Any],
+              offset: int = 0) -> str:
+        # 1) newest turns that fit the budget (the last turn is always kept)
+        used, start = 0, len(messages)
+        while start > 0:
+            cost = _approx_tokens(messages[start - 1]["content"]) + 2
+            if used + cost > budget_tokens and start < len(messages):
+                break
+            used += cost
+            start -= 1
+
+        # 2) fold turns evicted since the last request into the rolling summary;
+        #    turns the store trimmed before they were summarized are gone for good
+        evicted_from = min(start, max(0, state.get("summarized", 0) - offset))
+        if evicted_from < start:
+            lines = state.get("summary", []) + [self._summary_line(m) for m in messages[evicted_from:start]]
+            total = sum(_approx_tokens(l) for l in lines)
+            while lines and total > self.summary_tokens:
+                total -= _approx_tokens(lines.pop(0))
+            state["summary"] = lines
+            state["summarized"] = offset + start
+
+        parts = []
+        if state.get("summary"):
+            parts.append("Earlier conversation (summary):\n" + "\n".join(state["summary"]))
+        window = [f"{m['role']}: {m['content']}" for m in messages[start:]]
+        if window and used > budget_tokens:
+            window[0] = window[0][:budget_tokens * 4]  # a single oversized turn
+        parts.append("\n".join(window))
+        return "\n\n".join(parts)
+
+CONTEXT = ContextBuilder(summary_tokens=int(os.getenv("CONTEXT_SUMMARY_TOKENS", "300")))
+
 # --- Schemas ----------------------------------------------------------------
 class Message(BaseModel):
     role: Literal["system","user","assistant"]
@@ -112,6 +667,10 @@ class ChatRequest(BaseModel):
     policy: Optional[Dict[str, Any]] = None
     metadata: Optional[Dict[str, Any]] = None
 
+class BatchChatRequest(BaseModel):
+    requests: List[ChatRequest]
+    concurrency: Optional[int] = None
+
 class ChatResponse(BaseModel):
     session_id: str
     output: str
@@ -147,66 +706,339 @@ def _mk_e_prompt(context: str, phi_notes: str) -> List[Dict[str,str]]:
     return [{"role":"system","content":SYSTEM_E},
             {"role":"user","content":f"Context:\n{context}\n\nExecute with these notes:\n{phi_notes}"}]
 
-async def pi_phi_e(messages: List[Dict[str,str]], policy: Policy) -> Tuple[str, float, int, Dict[str,Any]]:
+# per-request log of upstream calls: [{"phase": "pi", "ms": 812.4}, ...]
+_UPSTREAM_CALLS: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("upstream_calls", default=None)
+
+async def _complete(phase: str, prompt: List[Dict[str,str]], policy: Policy, cacheable: bool = False,
+                    coalesce: bool = True) -> str:
+    """
+    Single choke point for upstream calls; records per-call latency (and cache
+    use). Identical concurrent calls share one upstream request unless
+    `coalesce` is False (best-of-N wants independent samples of one prompt).
+    """
+    t0 = time.perf_counter()
+    params = {"temperature": policy.temperature, "max_tokens": policy.max_tokens}
+    entry: Dict[str, Any] = {"phase": phase}
+    use_cache = cacheable and PHASE_CACHE is not None
+    key = PhaseCache.key(prompt, **params) if use_cache or (coalesce and COALESCE is not None) else ""
+
+    async def fetch() -> str:
+        await _rate_limit()
+        out = await ADAPTER.complete(prompt, **params)
+        if use_cache:
+            await PHASE_CACHE.put(key, out)
+        return out
+
+    try:
+        if use_cache:
+            out = await PHASE_CACHE.get(key)
+            entry["cache"] = "miss" if out is None else "hit"
+            if out is not None:
+                return out
+        if coalesce and COALESCE is not None:
+            out, joined = await COALESCE.do(key, fetch)
+            if joined:
+                entry["coalesced"] = True
+                METRICS.inc("metacog_upstream_coalesced_total", phase=phase)
+            return out
+        return await fetch()
+    except asyncio.CancelledError:
+        entry["cancelled"] = True
+        raise
+    except Exception:
+        if not entry.get("coalesced"):
+            METRICS.inc("metacog_upstream_errors_total", phase=phase)
+        raise
+    finally:
+        dt = time.perf_counter() - t0
+        if entry.get("cache") != "hit" and not entry.get("coalesced"):
+            METRICS.observe("metacog_upstream_seconds", dt, phase=phase)
+        calls = _UPSTREAM_CALLS.get()
+        if calls is not None:
+            entry["ms"] = round(1000 * dt, 2)
+            calls.append(entry)
+
+def _call_state(calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+    state: Dict[str, Any] = {"upstream_calls": calls}
+    if PHASE_CACHE is not None:
+        state["phase_cache"] = {
+            "hits": sum(1 for c in calls if c.get("cache") == "hit"),
+            "misses": sum(1 for c in calls if c.get("cache") == "miss"),
+        }
+    return state
+
+async def _complete_stream(phase: str, prompt: List[Dict[str,str]], policy: Policy) -> AsyncIterator[str]:
+    """Streaming twin of _complete(); the recorded latency spans the whole stream."""
+    t0 = time.perf_counter()
+    try:
+        await _rate_limit()
+        async for chunk in ADAPTER.stream(prompt, temperature=policy.temperature, max_tokens=policy.max_tokens):
+            yield chunk
+    except Exception:
+        METRICS.inc("metacog_upstream_errors_total", phase=phase)
+        raise
+    finally:
+        dt = time.perf_counter() - t0
+        METRICS.observe("metacog_upstream_seconds", dt, phase=phase)
+        calls = _UPSTREAM_CALLS.get()
+        if calls is not None:
+            calls.append({"phase": phase, "ms": round(1000 * dt, 2)})
+
+async def _perceive_integrate(messages: List[Dict[str,str]], policy: Policy,
+                              ctx_state: Optional[Dict[str, Any]] = None, offset: int = 0) -> Tuple[str, str, str]:
     # 1) Perception
     user_utterance = next((m["content"] for m in reversed(messages) if m["role"]=="user"), "")
-    pi = await ADAPTER.complete(_mk_pi_prompt(user_utterance),
-                                temperature=policy.temperature, max_tokens=policy.max_tokens)
+    with METRICS.timer("metacog_stage_seconds", stage="pi"):
+        pi = await _complete("pi", _mk_pi_prompt(user_utterance), policy, cacheable=True)
 
     # 2) Integration
-    history_context = "\n".join(f"{m['role']}: {m['content']}" for m in messages[-8:])
-    phi = await ADAPTER.complete(_mk_phi_prompt(history_context, pi),
-                                 temperature=policy.temperature, max_tokens=policy.max_tokens)
+    with METRICS.timer("metacog_stage_seconds", stage="phi"):
+        history_context = CONTEXT.build(messages, policy.context_tokens,
+                                        ctx_state if ctx_state is not None else {}, offset)
+        phi = await _complete("phi", _mk_phi_prompt(history_context, pi), policy, cacheable=True)
+    return pi, phi, history_context
+
+@contextmanager
+def _track_request():
+    METRICS.inc("metacog_in_flight", 1)
+    try:
+        with METRICS.timer("metacog_request_seconds"):
+            yield
+    finally:
+        METRICS.inc("metacog_in_flight", -1)
+
+def _finish(e: str, coherence: float, reflections: int, pi: str, phi: str,
+            calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+    METRICS.observe("metacog_coherence", coherence)
+    METRICS.observe("metacog_reflections", reflections)
+    with METRICS.timer("metacog_stage_seconds", stage="awaken"):
+        state = awaken(e, return_state=True)
+    state.update({"pi": pi, "phi": phi, **_call_state(calls)})
+    return state
+
+def _score(text: str) -> float:
+    with METRICS.timer("metacog_stage_seconds", stage="score_text"):
+        return score_text(text)
+
+async def pi_phi_e(messages: List[Dict[str,str]], policy: Policy,
+                   ctx_state: Optional[Dict[str, Any]] = None, offset: int = 0) -> Tuple[str, float, int, Dict[str,Any]]:
+    calls: List[Dict[str, Any]] = []
+    _UPSTREAM_CALLS.set(calls)
+
+    with _track_request():
+        pi, phi, history_context = await _perceive_integrate(messages, policy, ctx_state, offset)
+
+        # 3) Expansion
+        with METRICS.timer("metacog_stage_seconds", stage="e"):
+            e = await _complete("e", _mk_e_prompt(history_context, phi), policy)
 
-    # 3) Expansion
-    e = await ADAPTER.complete(_mk_e_prompt(history_context, phi),
-                               temperature=policy.temperature, max_tokens=policy.max_tokens)
+        with METRICS.timer("metacog_stage_seconds", stage="reflect"):
+            e, coherence, reflections = await _reflect(e, policy)
+        state = _finish(e, coherence, reflections, pi, phi, calls)
+    return e, coherence, reflections, state
+
+async def pi_phi_e_stream(messages: List[Dict[str,str]], policy: Policy,
+                          ctx_state: Optional[Dict[str, Any]] = None, offset: int = 0) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Same pipeline as pi_phi_e, but the e-phase is streamed: yields ("token", chunk)
+    as upstream tokens arrive, then ("done", (output, coherence, reflections, state)).
+    """
+    calls: List[Dict[str, Any]] = []
+    _UPSTREAM_CALLS.set(calls)
+
+    with _track_request():
+        pi, phi, history_context = await _perceive_integrate(messages, policy, ctx_state, offset)
+
+        # 3) Expansion, forwarded chunk by chunk
+        parts: List[str] = []
+        with METRICS.timer("metacog_stage_seconds", stage="e"):
+            async for chunk in _complete_stream("e", _mk_e_prompt(history_context, phi), policy):
+                parts.append(chunk)
+                yield "token", chunk
 
-    coherence = score_text(e)
+        with METRICS.timer("metacog_stage_seconds", stage="reflect"):
+            e, coherence, reflections = await _reflect("".join(parts), policy)
+        state = _finish(e, coherence, reflections, pi, phi, calls)
+    yield "done", (e, coherence, reflections, state)
+
+def _mk_critique_prompt(draft: str) -> List[Dict[str,str]]:
+    return [
+        {"role":"system","content":"Critique and improve the draft to be clearer, safer, more complete."},
+        {"role":"user","content":f"Draft:\n{draft}\n\nIssues to fix: clarity, factuality, structure."}
+    ]
+
+async def _reflect(e: str, policy: Policy) -> Tuple[str, float, int]:
+    coherence = _score(e)
     reflections = 0
+    if (coherence < policy.min_coherence and policy.reflection_mode == "best_of_n"
+            and policy.max_reflections > 0):
+        return await _reflect_best_of_n(e, coherence, policy)
 
     # Optional self-critique loop if coherence is low
     while coherence < policy.min_coherence and reflections < policy.max_reflections:
-        critique_prompt = [
-            {"role":"system","content":"Critique and improve the draft to be clearer, safer, more complete."},
-            {"role":"user","content":f"Draft:\n{e}\n\nIssues to fix: clarity, factuality, structure."}
-        ]
-        e = await ADAPTER.complete(critique_prompt,
-                                   temperature=policy.temperature, max_tokens=policy.max_tokens)
-        coherence = score_text(e)
+        e = await _complete("reflection", _mk_critique_prompt(e), policy)
+        coherence = _score(e)
         reflections += 1
+    return e, coherence, reflections
 
-    state = awaken(e, return_state=True)
-    state.update({"pi": pi, "phi": phi})
-    return e, coherence, reflections, state
+async def _reflect_best_of_n(e: str, coherence: float, policy: Policy) -> Tuple[str, float, int]:
+    """
+    Fire min(reflection_candidates, max_reflections) rewrites concurrently and
+    keep the best-scoring text (the original draft included). As soon as one candidate reaches
+    target_coherence the still-running calls are cancelled. Failed candidates
+    are skipped; reflections counts the candidates that came back.
+    """
+    prompt = _mk_critique_prompt(e)
+    pending = {asyncio.ensure_future(_complete("reflection", prompt, policy, coalesce=False))
+               for _ in range(max(1, min(policy.reflection_candidates, policy.max_reflections)))}
+    best, best_coh, reflections = e, coherence, 0
+    try:
+        while pending and best_coh < policy.target_coherence:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    continue
+                reflections += 1
+                candidate = task.result()
+                cand_coh = _score(candidate)
+                if cand_coh > best_coh:
+                    best, best_coh = candidate, cand_coh
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    return best, best_coh, reflections
 
 # --- FastAPI ----------------------------------------------------------------
-app = FastAPI(title="Quantara Metacognition Proxy", version="1.0")
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    await HTTP.start()
+    try:
+        yield
+    finally:
+        await HTTP.close()
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(req: ChatRequest = Body(...)):
+app = FastAPI(title="Quantara Metacognition Proxy", version="1.0", lifespan=_lifespan)
+
+async def _in_store(fn, *args):
+    # keep blocking stores (SQLite commits) off the event loop; in-memory ones stay inline
+    if MEM.blocking:
+        return await asyncio.to_thread(fn, *args)
+    return fn(*args)
+
+async def _open_session(req: ChatRequest) -> Tuple[str, Policy, Dict[str, Any]]:
     sid = req.session_id or str(uuid.uuid4())
     policy = DEFAULT_POLICY if not req.policy else Policy(**{**DEFAULT_POLICY.__dict__, **req.policy})
-    ses = MEM.get(sid)
-
     # merge past context with new messages
-    for m in req.messages:
-        ses["messages"].append({"role": m.role, "content": m.content})
+    ses = await _in_store(MEM.append_messages, sid, [{"role": m.role, "content": m.content} for m in req.messages])
+    return sid, policy, ses
+
+def _write_close(sid: str, ses: Dict[str, Any], output: str, coh: float, nref: int):
+    MEM.append_messages(sid, [{"role":"assistant","content": output}])
+    MEM.update_stats(sid, {"last_coherence": coh, "reflections": nref, "provider": os.getenv("UPSTREAM_PROVIDER","echo"),
+                           "context": ses["stats"].get("context", {})})
 
-    output, coh, nref, state = await pi_phi_e(ses["messages"], policy)
-    ses["messages"].append({"role":"assistant","content": output})
-    ses["stats"].update({"last_coherence": coh, "reflections": nref, "provider": os.getenv("UPSTREAM_PROVIDER","echo")})
-    MEM.set(sid, ses)
+async def _close_session(sid: str, ses: Dict[str, Any], output: str, coh: float, nref: int):
+    await _in_store(_write_close, sid, ses, output, coh, nref)
 
+async def handle_chat(req: ChatRequest) -> ChatResponse:
+    sid, policy, ses = await _open_session(req)
+    output, coh, nref, state = await pi_phi_e(ses["messages"], policy, ses["stats"].setdefault("context", {}),
+                                              ses.get("offset", 0))
+    await _close_session(sid, ses, output, coh, nref)
     return ChatResponse(session_id=sid, output=output, coherence=coh, reflections=nref, state=state)
 
+@app.post("/chat", response_model=ChatResponse)
+async def chat(req: ChatRequest = Body(...)):
+    return await handle_chat(req)
+
+async def run_batch(requests: Iterable[ChatRequest], concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run many chats concurrently, yielding {"index", "ok", "response"|"error"} in
+    completion order. A pool of `concurrency` workers pulls from `requests`
+    lazily, so at most that many pipelines (and their upstream calls, further
+    throttled by the provider token bucket) are in flight at once. The
+    requested concurrency is clamped to BATCH_CONCURRENCY_MAX and to the
+    number of requests, so a client cannot make the server spawn idle workers.
+    """
+    concurrency = concurrency or int(os.getenv("BATCH_CONCURRENCY", "8"))
+    concurrency = min(concurrency, int(os.getenv("BATCH_CONCURRENCY_MAX", "64")))
+    if hasattr(requests, "__len__"):
+        concurrency = min(concurrency, len(requests))
+    concurrency = max(1, concurrency)
+    pending = enumerate(requests)
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def worker():
+        try:
+            for i, req in pending:
+                try:
+                    resp = await handle_chat(req)
+                    results.put_nowait({"index": i, "ok": True, "response": jsonable_encoder(resp)})
+                except Exception as ex:
+                    results.put_nowait({"index": i, "ok": False, "error": f"{type(ex).__name__}: {ex}"})
+        finally:
+            results.put_nowait(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        running = len(workers)
+        while running:
+            item = await results.get()
+            if item is None:
+                running -= 1
+            else:
+                yield item
+    finally:
+        for w in workers:
+            w.cancel()
+
+@app.post("/chat/batch")
+async def chat_batch(req: BatchChatRequest = Body(...)):
+    async def lines():
+        async for item in run_batch(req.requests, req.concurrency):
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/chat/stream")
+async def chat_stream(req: ChatRequest = Body(...)):
+    """
+    Server-sent events: "session" first, then one "token" event per e-phase chunk,
+    then "done" with the ChatResponse body (output may differ from the streamed
+    draft if low coherence triggered reflections).
+    """
+    sid, policy, ses = await _open_session(req)
+
+    async def events():
+        yield _sse("session", {"session_id": sid})
+        async for kind, payload in pi_phi_e_stream(ses["messages"], policy, ses["stats"].setdefault("context", {}),
+                                                   ses.get("offset", 0)):
+            if kind == "token":
+                yield _sse("token", {"delta": payload})
+                continue
+            output, coh, nref, state = payload
+            await _close_session(sid, ses, output, coh, nref)
+            resp = ChatResponse(session_id=sid, output=output, coherence=coh, reflections=nref, state=state)
+            yield _sse("done", jsonable_encoder(resp))
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/state/{session_id}")
 def state(session_id: str):
     return MEM.get(session_id)
 
 @app.post("/reset/{session_id}")
 def reset(session_id: str):
-    MEM.set(session_id, {"messages": [], "stats": {}, "created": time.time()})
+    MEM.set(session_id, _new_session())
     return {"ok": True}
 
 @app.get("/")
@@ -216,5 +1048,5 @@ def root():
         "version": "1.0",
         "upstream": os.getenv("UPSTREAM_PROVIDER","echo"),
         "quantara_core": QUANTARA_AVAILABLE,
-        "routes": ["/chat", "/state/{session_id}", "/reset/{session_id}"]
+        "routes": ["/chat", "/chat/stream", "/chat/batch", "/metrics", "/state/{session_id}", "/reset/{session_id}"]
     }
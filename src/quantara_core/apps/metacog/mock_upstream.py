@@ -0,0 +1,161 @@
+# mock_upstream.py
+#
+# A local OpenAI-compatible stand-in for capacity testing metacog_app.
+# Answers POST /v1/chat/completions (plain JSON or SSE when "stream": true)
+# after a sampled delay, and fails a configurable fraction of calls, so the
+# proxy's pooling, rate limiting and concurrency behave as they would
+# against a real provider, without spending tokens.
+#
+# Run:
+#   pip install fastapi uvicorn
+#   python mock_upstream.py --port 9000 --latency lognormal:400,0.6 --error-rate 0.01
+#   # or: MOCK_LATENCY=uniform:100,900 python -m uvicorn mock_upstream:app --port 9000
+#
+# Point the proxy at it:
+#   export UPSTREAM_PROVIDER=openai OPENAI_API_KEY=mock OPENAI_BASE_URL=http://127.0.0.1:9000/v1
+#
+# Config (env or CLI flags):
+#   MOCK_LATENCY=fixed:50          time to first byte, in ms. One of
+#                                  fixed:<ms> | uniform:<lo>,<hi> | exp:<mean>
+#                                  | lognormal:<median>,<sigma>
+#   MOCK_TOKEN_DELAY=5             ms between streamed chunks
+#   MOCK_ERROR_RATE=0.0            fraction of calls answered with MOCK_ERROR_STATUS
+#   MOCK_ERROR_STATUS=500
+#   MOCK_REPLY_WORDS=40            words per completion (capped by max_tokens)
+#   MOCK_SEED=                     fix the RNG for reproducible runs
+
+from __future__ import annotations
+import os, json, math, time, uuid, random, asyncio, argparse
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from fastapi import FastAPI, Body
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# --- Latency distributions ---------------------------------------------------
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Parse a latency spec (see header) into a sampler returning seconds."""
+    kind, _, args = spec.partition(":")
+    try:
+        vals = [float(a) for a in args.split(",") if a]
+    except ValueError:
+        raise ValueError(f"bad latency spec: {spec!r}") from None
+    if kind == "fixed" and len(vals) == 1:
+        return lambda rng: vals[0] / 1000.0
+    if kind == "uniform" and len(vals) == 2:
+        return lambda rng: rng.uniform(vals[0], vals[1]) / 1000.0
+    if kind == "exp" and len(vals) == 1 and vals[0] > 0:
+        return lambda rng: rng.expovariate(1000.0 / vals[0])
+    if kind == "lognormal" and len(vals) == 2 and vals[0] > 0:
+        mu = math.log(vals[0] / 1000.0)
+        return lambda rng: rng.lognormvariate(mu, vals[1])
+    raise ValueError(f"bad latency spec: {spec!r}")
+
+@dataclass
+class MockConfig:
+    latency: str = "fixed:50"
+    token_delay_ms: float = 5.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    reply_words: int = 40
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> "MockConfig":
+        seed = os.getenv("MOCK_SEED", "")
+        return cls(
+            latency=os.getenv("MOCK_LATENCY", cls.latency),
+            token_delay_ms=float(os.getenv("MOCK_TOKEN_DELAY", str(cls.token_delay_ms))),
+            error_rate=float(os.getenv("MOCK_ERROR_RATE", str(cls.error_rate))),
+            error_status=int(os.getenv("MOCK_ERROR_STATUS", str(cls.error_status))),
+            reply_words=int(os.getenv("MOCK_REPLY_WORDS", str(cls.reply_words))),
+            seed=int(seed) if seed else None,
+        )
+
+# --- Reply synthesis ---------------------------------------------------------
+def _reply(messages: List[Dict[str, str]], words: int) -> str:
+    last = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    seed = last.split() or ["ok"]
+    out = ["(mock)"] + [seed[i % len(seed)] for i in range(max(0, words - 1))]
+    return " ".join(out)
+
+def _chunk(cid: str, model: str, delta: Dict[str, Any], finish: Optional[str] = None) -> str:
+    body = {"id": cid, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+    return f"data: {json.dumps(body)}\n\n"
+
+# --- App ---------------------------------------------------------------------
+def create_app(cfg: Optional[MockConfig] = None) -> FastAPI:
+    cfg = cfg or MockConfig.from_env()
+    rng = random.Random(cfg.seed)
+    sample = parse_latency(cfg.latency)
+    stats = {"requests": 0, "errors": 0, "in_flight": 0, "max_in_flight": 0}
+    app = FastAPI(title="Mock OpenAI Upstream", version="0.1.0")
+    app.state.config, app.state.stats = cfg, stats
+
+    @app.post("/v1/chat/completions")
+    async def completions(body: Dict[str, Any] = Body(...)):
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            await asyncio.sleep(sample(rng))
+            if rng.random() < cfg.error_rate:
+                stats["errors"] += 1
+                return JSONResponse({"error": {"message": "mock upstream failure", "type": "server_error"}},
+                                    status_code=cfg.error_status)
+        finally:
+            stats["in_flight"] -= 1
+
+        model = body.get("model", "mock")
+        words = min(cfg.reply_words, int(body.get("max_tokens") or cfg.reply_words))
+        text = _reply(body.get("messages", []), words)
+        cid = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        if not body.get("stream"):
+            return {
+                "id": cid, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": words, "total_tokens": words},
+            }
+
+        async def events() -> AsyncIterator[str]:
+            yield _chunk(cid, model, {"role": "assistant"})
+            for i, word in enumerate(text.split(" ")):
+                if cfg.token_delay_ms:
+                    await asyncio.sleep(cfg.token_delay_ms / 1000.0)
+                yield _chunk(cid, model, {"content": word if i == 0 else " " + word})
+            yield _chunk(cid, model, {}, finish="stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    def get_stats():
+        return stats
+
+    return app
+
+app = create_app()
+
+def main(argv: Optional[List[str]] = None):
+    env = MockConfig.from_env()
+    ap = argparse.ArgumentParser(description="Local OpenAI-compatible mock upstream.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9000)
+    ap.add_argument("--latency", default=env.latency)
+    ap.add_argument("--token-delay", type=float, default=env.token_delay_ms)
+    ap.add_argument("--error-rate", type=float, default=env.error_rate)
+    ap.add_argument("--error-status", type=int, default=env.error_status)
+    ap.add_argument("--reply-words", type=int, default=env.reply_words)
+    ap.add_argument("--seed", type=int, default=env.seed)
+    args = ap.parse_args(argv)
+    parse_latency(args.latency)  # fail fast on a bad spec
+
+    import uvicorn
+    cfg = MockConfig(args.latency, args.token_delay, args.error_rate, args.error_status,
+                     args.reply_words, args.seed)
+    uvicorn.run(create_app(cfg), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Quantara Embedding Backend Benchmark
+------------------------------------
+Compare embedding backends for LLMCoherenceScorer on the same corpus:
+throughput (docs/s, sentences/s) and agreement of the resulting scores
+with a reference backend (MiniLM by default).
+
+Run (from src/quantara_core):
+    python -m coherence_field.backend_benchmark --corpus outputs.jsonl --backends minilm hashing
+The corpus is JSONL with a "text" field (or plain text, one document per
+line). Without --corpus a small built-in sample is used.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Sequence
+import argparse
+import json
+import time
+
+import numpy as np
+
+from .embedding_backends import make_backend
+from .llm_coherence_score import LLMCoherenceScorer
+
+_SAMPLE = [
+    "The sky is blue. Water is wet. Apples are red. Ethical AI recovers coherence.",
+    "Sentence one flows. Sentence two connects well. Sentence three aligns.",
+    "Random idea. Unrelated thought. Sudden drift.",
+    "We deploy in phases. Phase one covers the pilot region. Phase two extends it to the grid.",
+    "Budgets matter. The cat sat on the mat. Quantum wires hum at night?",
+]
+
+
+def load_corpus(path: str, limit: int = 0) -> List[str]:
+    docs: List[str] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+                docs.append(rec["text"] if isinstance(rec, dict) else str(rec))
+            except (json.JSONDecodeError, KeyError):
+                docs.append(line)
+            if limit and len(docs) >= limit:
+                break
+    return docs
+
+
+def _ranks(x: np.ndarray) -> np.ndarray:
+    r = np.empty(len(x))
+    r[np.argsort(x, kind="stable")] = np.arange(len(x))
+    return r
+
+
+def _corr(a: np.ndarray, b: np.ndarray) -> float:
+    if len(a) < 2 or a.std() == 0 or b.std() == 0:
+        return float("nan")
+    return float(np.corrcoef(a, b)[0, 1])
+
+
+def benchmark(docs: Sequence[str], specs: Sequence[str], reference: str = "minilm",
+              batch_size: int = 64) -> Dict[str, Dict[str, float]]:
+    """Score `docs` with every backend; report throughput and agreement vs `reference`."""
+    n_sent = sum(len(LLMCoherenceScorer._split_sentences(d)) for d in docs)
+    runs: Dict[str, List[Dict[str, float]]] = {}
+    report: Dict[str, Dict[str, float]] = {}
+    for spec in dict.fromkeys([reference, *specs]):
+        scorer = LLMCoherenceScorer(backend=make_backend(spec))
+        scorer.score_many(docs[:2], batch_size=batch_size)  # warm-up / model load
+        t0 = time.perf_counter()
+        runs[spec] = scorer.score_many(docs, batch_size=batch_size)
+        dt = time.perf_counter() - t0
+        report[spec] = {"docs_per_s": len(docs) / dt, "sentences_per_s": n_sent / dt, "seconds": dt}
+
+    ref = np.array([r["overall"] for r in runs[reference]], dtype=np.float64)
+    ref_flags = [r["flag"] for r in runs[reference]]
+    for spec, results in runs.items():
+        cur = np.array([r["overall"] for r in results], dtype=np.float64)
+        report[spec].update({
+            "pearson": _corr(ref, cur),
+            "spearman": _corr(_ranks(ref), _ranks(cur)),
+            "mean_abs_diff": float(np.mean(np.abs(ref - cur))) if len(cur) else 0.0,
+            "flag_agreement": float(np.mean([a == b for a, b in zip(ref_flags, (r["flag"] for r in results))]))
+            if results else 0.0,
+        })
+    return report
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    ap.add_argument("--corpus", help="JSONL (with 'text') or plain-text file, one doc per line")
+    ap.add_argument("--limit", type=int, default=0, help="max documents to read (0 = all)")
+    ap.add_argument("--backends", nargs="+", default=["hashing"])
+    ap.add_argument("--reference", default="minilm")
+    ap.add_argument("--batch-size", type=int, default=64)
+    args = ap.parse_args(argv)
+
+    docs = load_corpus(args.corpus, args.limit) if args.corpus else _SAMPLE * 20
+    report = benchmark(docs, args.backends, reference=args.reference, batch_size=args.batch_size)
+    print(f"{len(docs)} documents, reference={args.reference}")
+    print(f"{'backend':<28}{'docs/s':>10}{'sent/s':>10}{'pearson':>9}{'spearman':>9}{'|Δ|':>8}{'flags':>7}")
+    for spec, r in report.items():
+        print(f"{spec:<28}{r['docs_per_s']:>10.1f}{r['sentences_per_s']:>10.1f}"
+              f"{r['pearson']:>9.3f}{r['spearman']:>9.3f}{r['mean_abs_diff']:>8.3f}{r['flag_agreement']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
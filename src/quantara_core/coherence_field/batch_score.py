@@ -0,0 +1,202 @@
+"""
+Quantara Batch Scorer
+---------------------
+Corpus-scale offline scoring with LLMCoherenceScorer.
+
+Streams a JSONL corpus lazily, cuts it into shards and scores them on a
+process pool in which every worker loads its model once. Results (the
+triad, overall score and flag per document) go to a JSONL or CSV file in
+input order. After every shard a checkpoint records how far the input
+and output have advanced, so a killed run resumes where it stopped.
+Only `max_inflight` shards are ever held in memory, whatever the corpus size.
+
+Run (from src/quantara_core):
+    python -m coherence_field.batch_score corpus.jsonl scores.jsonl --processes 8
+    # ...killed? run the same command again to resume
+"""
+
+from __future__ import annotations
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import csv
+import io
+import json
+import multiprocessing as mp
+import os
+
+from .embedding_backends import make_backend
+from .llm_coherence_score import LLMCoherenceScorer
+
+COLUMNS = ["line", "id", "kappa", "delta_phi", "omega", "overall", "flag", "error"]
+
+# (line number, id, text); text is None when the line could not be parsed
+Doc = Tuple[int, Any, Optional[str]]
+
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(backend: Optional[str], model_name: str, options: Dict[str, Any]) -> None:
+    _worker["scorer"] = LLMCoherenceScorer(model_name=model_name,
+                                           backend=make_backend(backend, model_name=model_name))
+    _worker["options"] = options
+
+
+def _score_shard(shard: List[Doc]) -> List[Dict[str, Any]]:
+    scorer, opts = _worker["scorer"], _worker["options"]
+    ok = [d for d in shard if d[2] is not None]
+    results = iter(scorer.score_many([d[2] for d in ok], **opts))
+    rows = []
+    for line, doc_id, text in shard:
+        row: Dict[str, Any] = {"line": line, "id": doc_id}
+        if text is None:
+            row["error"] = "unparseable input line"
+        else:
+            r = next(results)
+            row.update(kappa=float(r["kappa"]), delta_phi=float(r["delta_phi"]),
+                       omega=float(r["omega"]), overall=float(r["overall"]), flag=r["flag"])
+        rows.append(row)
+    return rows
+
+
+def read_shards(path: str, offset: int, first_line: int, shard_size: int,
+                text_field: str, id_field: str) -> Iterator[Tuple[List[Doc], int]]:
+    """Yield (shard, input byte offset after the shard), reading lazily from `offset`."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        shard: List[Doc] = []
+        line_no = first_line
+        while True:
+            raw = f.readline()
+            if not raw:
+                break
+            line_no += 1
+            if not raw.strip():
+                continue
+            try:
+                rec = json.loads(raw)
+                text = str(rec.get(text_field) or "") if isinstance(rec, dict) else str(rec)
+                doc_id = rec.get(id_field, line_no) if isinstance(rec, dict) else line_no
+            except ValueError:  # bad JSON or invalid UTF-8
+                text, doc_id = None, line_no
+            shard.append((line_no, doc_id, text))
+            if len(shard) >= shard_size:
+                yield shard, f.tell()
+                shard = []
+        if shard:
+            yield shard, f.tell()
+
+
+class _Checkpoint:
+    """Atomic JSON checkpoint next to the output file."""
+
+    def __init__(self, output: str):
+        self.path = Path(f"{output}.ckpt")
+
+    def load(self, input_path: str) -> Dict[str, int]:
+        if not self.path.exists():
+            return {"input_offset": 0, "lines_done": 0, "output_bytes": 0, "docs_done": 0}
+        state = json.loads(self.path.read_text())
+        if state.get("input") != os.path.abspath(input_path):
+            raise ValueError(f"checkpoint {self.path} belongs to {state.get('input')}")
+        return state
+
+    def save(self, input_path: str, **state: int) -> None:
+        tmp = self.path.with_suffix(".ckpt.tmp")
+        tmp.write_text(json.dumps({"input": os.path.abspath(input_path), **state}))
+        os.replace(tmp, self.path)
+
+
+def _format_rows(rows: List[Dict[str, Any]], fmt: str) -> str:
+    if fmt == "jsonl":
+        return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+    buf = io.StringIO()
+    csv.DictWriter(buf, fieldnames=COLUMNS, lineterminator="\n").writerows(rows)
+    return buf.getvalue()
+
+
+def run(input_path: str, output_path: str, processes: int = 0, shard_size: int = 256,
+        max_inflight: Optional[int] = None, fmt: str = "jsonl", backend: Optional[str] = None,
+        model_name: str = 'all-MiniLM-L6-v2', text_field: str = "text", id_field: str = "id",
+        ethical_keywords: Optional[Sequence[str]] = None, mode: str = "consecutive",
+        batch_size: int = 64) -> int:
+    """
+    Score `input_path` into `output_path`, resuming from its checkpoint if present.
+    processes=0 scores in-process. Returns the number of documents scored in total.
+    """
+    options = {"ethical_keywords": list(ethical_keywords) if ethical_keywords else None,
+               "mode": mode, "batch_size": batch_size}
+    ckpt = _Checkpoint(output_path)
+    state = ckpt.load(input_path)
+
+    out_file = Path(output_path)
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_file, "a+b") as out:
+        # drop anything written after the last checkpoint (a shard cut off mid-write)
+        out.truncate(state["output_bytes"])
+        if state["output_bytes"] == 0 and fmt == "csv":
+            out.write((",".join(COLUMNS) + "\n").encode("utf-8"))
+
+        shards = read_shards(input_path, state["input_offset"], state["lines_done"],
+                             shard_size, text_field, id_field)
+
+        def commit(rows: List[Dict[str, Any]], offset: int) -> None:
+            out.write(_format_rows(rows, fmt).encode("utf-8"))
+            out.flush()
+            os.fsync(out.fileno())
+            state.update(input_offset=offset, lines_done=rows[-1]["line"],
+                         output_bytes=out.tell(), docs_done=state["docs_done"] + len(rows))
+            ckpt.save(input_path, **state)
+
+        if processes <= 0:
+            _init_worker(backend, model_name, options)
+            for shard, offset in shards:
+                commit(_score_shard(shard), offset)
+            return state["docs_done"]
+
+        max_inflight = max_inflight or 2 * processes
+        with mp.get_context("spawn").Pool(processes, initializer=_init_worker,
+                                          initargs=(backend, model_name, options)) as pool:
+            inflight: deque = deque()
+            for shard, offset in shards:
+                inflight.append((pool.apply_async(_score_shard, (shard,)), offset))
+                if len(inflight) >= max_inflight:
+                    res, off = inflight.popleft()
+                    commit(res.get(), off)
+            while inflight:
+                res, off = inflight.popleft()
+                commit(res.get(), off)
+    return state["docs_done"]
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Score a JSONL corpus with LLMCoherenceScorer.")
+    ap.add_argument("input", help="JSONL corpus, one document per line")
+    ap.add_argument("output", help="output file (.jsonl or .csv); <output>.ckpt holds progress")
+    ap.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                    help="worker processes (0 = score in this process)")
+    ap.add_argument("--shard-size", type=int, default=256)
+    ap.add_argument("--max-inflight", type=int, default=None)
+    ap.add_argument("--format", choices=["jsonl", "csv"], default=None,
+                    help="defaults from the output extension")
+    ap.add_argument("--backend", default=None, help="minilm | hashing | st:<model>")
+    ap.add_argument("--model", default='all-MiniLM-L6-v2')
+    ap.add_argument("--text-field", default="text")
+    ap.add_argument("--id-field", default="id")
+    ap.add_argument("--ethical-keywords", default="", help="comma-separated")
+    ap.add_argument("--mode", default="consecutive")
+    ap.add_argument("--batch-size", type=int, default=64)
+    args = ap.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.output.endswith(".csv") else "jsonl")
+    keywords = [k for k in args.ethical_keywords.split(",") if k]
+    n = run(args.input, args.output, processes=args.processes, shard_size=args.shard_size,
+            max_inflight=args.max_inflight, fmt=fmt, backend=args.backend, model_name=args.model,
+            text_field=args.text_field, id_field=args.id_field, ethical_keywords=keywords,
+            mode=args.mode, batch_size=args.batch_size)
+    print(f"scored {n} documents -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
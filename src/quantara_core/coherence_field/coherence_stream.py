@@ -0,0 +1,88 @@
+"""
+Quantara Coherence Stream
+-------------------------
+Incremental coherence scoring for token-by-token LLM output.
+
+A CoherenceStream accepts text chunks as they arrive, detects sentence
+boundaries with the same rule as LLMCoherenceScorer, embeds each newly
+completed sentence once and advances a QuantaraField one tick per
+sentence pair. The running (κ, Δφ, Ω) triad is available after every
+chunk, so a caller can cut a drifting draft short:
+
+    stream = scorer.stream()
+    for chunk in upstream_tokens():
+        for kappa, delta_phi, omega in stream.feed(chunk):
+            if delta_phi > omega:   # stability condition |Δφ| ≤ Ω broken
+                ...                 # stop generation early
+    result = stream.close()         # same dict as scorer.score(full_text)
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .fieldmap_quantara import QuantaraField
+
+Triad = Tuple[float, float, float]
+
+
+class CoherenceStream:
+    """One streaming scoring session; create via LLMCoherenceScorer.stream()."""
+
+    def __init__(self, scorer, field: Optional[QuantaraField] = None):
+        from .llm_coherence_score import _SENTENCE_SPLIT
+        self._split = _SENTENCE_SPLIT.split
+        self.scorer = scorer
+        self.field = field or QuantaraField()
+        self.sentences: List[str] = []
+        self._buf = ""
+        self._prev: Optional[np.ndarray] = None
+        self._result: Optional[Dict[str, float]] = None
+
+    @property
+    def triad(self) -> Triad:
+        st = self.field.state
+        return st.kappa, st.delta_phi, st.omega
+
+    @property
+    def stable(self) -> bool:
+        """Stability condition |Δφ| ≤ Ω on the running triad."""
+        st = self.field.state
+        return st.delta_phi <= st.omega
+
+    def feed(self, chunk: str) -> List[Triad]:
+        """Add streamed text; returns one triad per newly completed sentence pair."""
+        if self._result is not None:
+            raise RuntimeError("stream already closed")
+        self._buf += chunk
+        pieces = self._split(self._buf)
+        # everything before the last boundary is final; the tail may still grow
+        self._buf = pieces.pop()
+        return [t for t in (self._push(p.strip()) for p in pieces if p.strip()) if t is not None]
+
+    def iter_triads(self, chunks: Iterable[str]) -> Iterator[Triad]:
+        """Feed an iterable of chunks, yielding triads as sentences complete."""
+        for chunk in chunks:
+            yield from self.feed(chunk)
+
+    def close(self, ethical_keywords: List[str] = None) -> Dict[str, float]:
+        """Flush the trailing sentence and return the score() result dict."""
+        if self._result is None:
+            tail = self._buf.strip()
+            self._buf = ""
+            if tail:
+                self._push(tail)
+            if len(self.sentences) < 2:
+                self.field.step(1.0)  # same convention as score(): single sentence is coherent
+            self._result = self.scorer._summarize(self.sentences, self.triad, ethical_keywords)
+        return self._result
+
+    def _push(self, sentence: str) -> Optional[Triad]:
+        self.sentences.append(sentence)
+        emb = self.scorer._encode([sentence])[0]
+        prev, self._prev = self._prev, emb
+        if prev is None:
+            return None
+        sim = float(np.clip(np.dot(prev, emb), 0.0, 1.0))
+        return self.field.step(sim)
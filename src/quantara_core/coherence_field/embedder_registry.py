@@ -0,0 +1,63 @@
+"""
+Quantara Embedder Registry
+--------------------------
+Process-wide, thread-safe registry of SentenceTransformer models.
+
+Every model is loaded once per (model_name, device) and shared by all
+LLMCoherenceScorer instances. Loading happens on first use, or up front
+via warm_up() so servers can pay the cost at boot; unload() releases
+the weights again. torch and sentence_transformers are only imported
+when a model is actually needed.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+
+_models: Dict[Tuple[str, str], Any] = {}
+_key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def default_device() -> str:
+    import torch
+    return 'cuda' if torch.cuda.is_available() else 'cpu'
+
+
+def get_embedder(model_name: str, device: Optional[str] = None):
+    """Return the shared model for (model_name, device), loading it if needed."""
+    key = (model_name, device or default_device())
+    model = _models.get(key)
+    if model is not None:
+        return model
+    with _lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+    # per-key lock: concurrent callers of the same model wait for one load,
+    # other models keep loading in parallel
+    with key_lock:
+        model = _models.get(key)
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(model_name, device=key[1])
+            _models[key] = model
+    return model
+
+
+def warm_up(*model_names: str, device: Optional[str] = None) -> None:
+    """Eagerly load models, e.g. from a server startup hook."""
+    for name in model_names or ('all-MiniLM-L6-v2',):
+        get_embedder(name, device)
+
+
+def unload(model_name: Optional[str] = None, device: Optional[str] = None) -> int:
+    """Drop matching models (all when no filter is given); returns how many."""
+    with _lock:
+        keys = [k for k in _models
+                if (model_name is None or k[0] == model_name) and (device is None or k[1] == device)]
+        for k in keys:
+            del _models[k]
+    return len(keys)
+
+
+def loaded() -> List[Tuple[str, str]]:
+    return list(_models)
@@ -0,0 +1,136 @@
+"""
+Quantara Embedding Backends
+---------------------------
+Pluggable sentence encoders for LLMCoherenceScorer.
+
+Every backend returns unit-normalized float32 rows, so cosine similarity
+is a plain dot product downstream.
+
+- SentenceTransformerBackend: the default MiniLM model via the shared
+  embedder registry (imports torch on first use only).
+- HashingNgramBackend: dependency-light NumPy encoder using signed,
+  hashed character n-grams. No model weights, no torch; meant for
+  CPU-only edge nodes where import time and RAM matter more than
+  semantic depth.
+
+Pick one per deployment with make_backend() or the
+QUANTARA_EMBEDDING_BACKEND environment variable ("minilm" / "hashing").
+Use backend_benchmark.py to compare throughput and score agreement.
+"""
+
+from __future__ import annotations
+from typing import Optional, Sequence, Tuple
+import os
+
+import numpy as np
+
+from .embedder_registry import default_device, get_embedder
+
+
+class EmbeddingBackend:
+    """Interface: encode sentences into unit-normalized float32 vectors."""
+
+    name: str = "base"
+
+    def encode(self, sentences: Sequence[str], batch_size: int = 64) -> np.ndarray:
+        raise NotImplementedError
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', device: Optional[str] = None):
+        self.model_name = model_name
+        self._device = device
+        self.name = f"st:{model_name}"
+
+    @property
+    def device(self) -> str:
+        if self._device is None:
+            self._device = default_device()
+        return self._device
+
+    @property
+    def model(self):
+        return get_embedder(self.model_name, self.device)
+
+    def encode(self, sentences: Sequence[str], batch_size: int = 64) -> np.ndarray:
+        return self.model.encode(list(sentences), batch_size=batch_size, convert_to_numpy=True,
+                                 normalize_embeddings=True, device=self.device)
+
+
+class HashingNgramBackend(EmbeddingBackend):
+    """
+    Signed feature hashing of character n-grams (plus sublinear tf).
+
+    N-gram hashes are computed for a whole batch at once with a vectorized
+    polynomial rolling hash over the UTF-8 bytes, then bucketed with one
+    bincount. Deterministic across processes (no reliance on hash()).
+    Sentences are processed `chunk_size` at a time; the scorer's batch_size
+    (a model batching knob) is accepted but not needed here.
+    """
+
+    def __init__(self, dim: int = 1024, ngram_range: Tuple[int, int] = (3, 5),
+                 chunk_size: int = 2048):
+        if dim & (dim - 1):
+            raise ValueError("dim must be a power of two")
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.chunk_size = chunk_size
+        self.name = f"hashing:{dim}:{ngram_range[0]}-{ngram_range[1]}"
+        self._shift = np.uint64(64 - int(np.log2(dim)) - 1)
+
+    def encode(self, sentences: Sequence[str], batch_size: int = 64) -> np.ndarray:
+        out = np.empty((len(sentences), self.dim), dtype=np.float32)
+        for start in range(0, len(sentences), self.chunk_size):
+            chunk = sentences[start:start + self.chunk_size]
+            out[start:start + len(chunk)] = self._encode_chunk(chunk)
+        return out
+
+    def _encode_chunk(self, sentences: Sequence[str]) -> np.ndarray:
+        n_sent = len(sentences)
+        # pad each sentence with spaces so word edges become n-gram features
+        raw = [f" {s.lower()} ".encode("utf-8") for s in sentences]
+        lengths = np.fromiter((len(r) for r in raw), dtype=np.int64, count=n_sent)
+        data = np.frombuffer(b"".join(raw), dtype=np.uint8).astype(np.uint64)
+        owner = np.repeat(np.arange(n_sent), lengths)
+        ends = np.cumsum(lengths)
+
+        counts = np.zeros(n_sent * self.dim, dtype=np.float64)
+        golden = np.uint64(0x9E3779B97F4A7C15)
+        for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+            m = data.shape[0] - n + 1
+            if m <= 0:
+                continue
+            h = np.full(m, np.uint64(n))
+            for j in range(n):
+                h = h * np.uint64(1099511628211) + data[j:j + m]  # FNV-style mix, wraps mod 2^64
+            starts = np.arange(m)
+            valid = starts + n <= ends[owner[:m]]  # drop n-grams spanning two sentences
+            mixed = h[valid] * golden
+            bucket = (mixed >> self._shift).astype(np.int64)
+            sign = np.where(bucket & 1, 1.0, -1.0)
+            counts += np.bincount(owner[:m][valid] * self.dim + (bucket >> 1), weights=sign,
+                                  minlength=counts.shape[0])
+
+        vecs = counts.reshape(n_sent, self.dim)
+        vecs = np.sign(vecs) * np.log1p(np.abs(vecs))
+        norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vecs / norms).astype(np.float32)
+
+
+def make_backend(spec: Optional[str] = None, model_name: str = 'all-MiniLM-L6-v2',
+                 device: Optional[str] = None) -> EmbeddingBackend:
+    """
+    Build a backend from a short spec: "minilm" / "st" (default, SentenceTransformer
+    `model_name`), "st:<model>" or "hashing". Falls back to
+    $QUANTARA_EMBEDDING_BACKEND when no spec is given.
+    """
+    spec = spec or os.getenv("QUANTARA_EMBEDDING_BACKEND", "minilm")
+    kind = spec.lower()
+    if kind == "hashing":
+        return HashingNgramBackend()
+    if kind.startswith("st:"):
+        return SentenceTransformerBackend(spec[3:], device)
+    if kind in ("minilm", "st"):
+        return SentenceTransformerBackend(model_name, device)
+    raise ValueError(f"unknown embedding backend: {spec!r}")
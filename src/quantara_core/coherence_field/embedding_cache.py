@@ -0,0 +1,221 @@
+"""
+Quantara Embedding Cache
+------------------------
+Content-addressed sentence-embedding cache for LLMCoherenceScorer.
+
+Two tiers, both keyed by a hash of (namespace, sentence):
+- memory: bounded LRU of float32 vectors inside the process
+- disk (optional): a memory-mapped float32 matrix plus an append-only
+  index file, shared by every process that opens the same directory.
+  Vectors are written before their index line, so readers never see a
+  row that is not there yet; writers serialize through a file lock.
+
+Counters (hits / disk_hits / misses / evictions) are exposed via stats()
+so the capacity can be sized from real traffic.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+import hashlib
+import json
+import os
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: single-process use only
+    fcntl = None
+
+
+def _content_key(namespace: str, text: str) -> str:
+    return hashlib.blake2b(f"{namespace}\x00{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class _DiskTier:
+    """Memory-mapped float32 matrix + `key<TAB>row` index, safe across processes."""
+
+    def __init__(self, root: str, dim: int, capacity: int):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        meta_path = self.root / "meta.json"
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            if meta["dim"] != dim:
+                raise ValueError(f"disk cache at {root} holds dim={meta['dim']}, got dim={dim}")
+            capacity = meta["capacity"]
+        else:
+            meta_path.write_text(json.dumps({"dim": dim, "capacity": capacity}))
+        self.dim, self.capacity = dim, capacity
+        self._matrix_path = self.root / "embeddings.f32"
+        self._index_path = self.root / "index.tsv"
+        self._index_path.touch(exist_ok=True)
+        if not self._matrix_path.exists() or self._matrix_path.stat().st_size < capacity * dim * 4:
+            with self._matrix_path.open("ab") as f:
+                f.truncate(capacity * dim * 4)  # sparse on most filesystems
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r+", shape=(capacity, dim))
+        self._rows: Dict[str, int] = {}
+        self._offset = 0
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def refresh(self) -> None:
+        """Pick up index lines appended by other processes."""
+        if self._index_path.stat().st_size == self._offset:
+            return
+        with self._index_path.open("r", encoding="utf-8") as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # partially written line; read it next time
+                key, row = line.rstrip("\n").split("\t")
+                self._rows[key] = int(row)
+                self._offset += len(line.encode("utf-8"))
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self._rows.get(key)
+        return None if row is None else self._matrix[row]
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray) -> int:
+        """Append vectors not yet on disk; returns how many were written."""
+        with self._index_path.open("a", encoding="utf-8") as idx:
+            if fcntl:
+                fcntl.flock(idx, fcntl.LOCK_EX)
+            try:
+                self.refresh()
+                lines = []
+                nxt = len(self._rows)
+                for key, vec in zip(keys, vectors):
+                    if key in self._rows or nxt >= self.capacity:
+                        continue
+                    self._matrix[nxt] = vec
+                    self._rows[key] = nxt
+                    lines.append(f"{key}\t{nxt}\n")
+                    nxt += 1
+                if lines:
+                    self._matrix.flush()
+                    data = "".join(lines)
+                    idx.write(data)
+                    idx.flush()
+                    self._offset += len(data.encode("utf-8"))
+                return len(lines)
+            finally:
+                if fcntl:
+                    fcntl.flock(idx, fcntl.LOCK_UN)
+
+
+class EmbeddingCache:
+    """
+    LRU (+ optional mmap disk) cache in front of any batch sentence encoder.
+
+    encode(sentences, encoder) returns one float32 row per sentence and calls
+    `encoder` only for unique sentences missing from both tiers.
+    """
+
+    def __init__(self, capacity: int = 50_000, namespace: str = "",
+                 disk_path: Optional[str] = None, disk_capacity: int = 1_000_000):
+        self.capacity = capacity
+        self.namespace = namespace
+        self.disk_path = disk_path
+        self.disk_capacity = disk_capacity
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._disk: Optional[_DiskTier] = None
+        self.dim: Optional[int] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ----- public API -----
+
+    def encode(self, sentences: Sequence[str],
+               encoder: Callable[[List[str]], np.ndarray],
+               namespace: Optional[str] = None) -> np.ndarray:
+        """`namespace` overrides self.namespace, so one cache can serve several encoders."""
+        ns = self.namespace if namespace is None else namespace
+        keys = [_content_key(ns, s) for s in sentences]
+        rows: List[Optional[np.ndarray]] = [None] * len(keys)
+        missing: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            vec = self._lookup(key) if key not in missing else None
+            if vec is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                rows[i] = vec
+
+        if missing:
+            vectors = np.asarray(encoder([sentences[ix[0]] for ix in missing.values()]),
+                                 dtype=np.float32)
+            self.misses += len(missing)
+            self.hits += sum(len(ix) - 1 for ix in missing.values())
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            for (key, ix), vec in zip(missing.items(), vectors):
+                vec = vec.copy()  # own the row so the LRU doesn't pin the whole batch
+                self._remember(key, vec)
+                for i in ix:
+                    rows[i] = vec
+            disk = self._disk_tier()
+            if disk is not None and disk.dim == vectors.shape[1]:
+                disk.put_many(list(missing), vectors)
+
+        if not rows:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return np.stack(rows)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._lru),
+            "disk_entries": len(self._disk) if self._disk is not None else 0,
+        }
+
+    def clear(self) -> None:
+        """Drop the memory tier (the disk tier is shared and left untouched)."""
+        self._lru.clear()
+
+    # ----- internals -----
+
+    def _disk_tier(self) -> Optional[_DiskTier]:
+        if self._disk is None and self.disk_path and self.dim is not None:
+            self._disk = _DiskTier(self.disk_path, self.dim, self.disk_capacity)
+        return self._disk
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        vec = self._lru.get(key)
+        if vec is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return vec
+        if self._disk is None and self.disk_path and os.path.exists(os.path.join(self.disk_path, "meta.json")):
+            meta = json.loads(Path(self.disk_path, "meta.json").read_text())
+            self.dim = self.dim or meta["dim"]
+            self._disk_tier()
+        if self._disk is None:
+            return None
+        vec = self._disk.get(key)
+        if vec is None:
+            self._disk.refresh()
+            vec = self._disk.get(key)
+        if vec is None:
+            return None
+        self.hits += 1
+        self.disk_hits += 1
+        self._remember(key, vec)  # memmap row view, no copy
+        return vec
+
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.capacity:
+            self._lru.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,162 @@
+"""
+Quantara Field Bank
+-------------------
+Struct-of-arrays engine for running many QuantaraFields in lockstep.
+
+One bank holds the triad (κ, Δφ, Ω), the tick counter and every
+FieldConfig knob as contiguous NumPy arrays, so a whole population of
+fields advances with a single vectorized step() per tick.
+
+While stepping, the bank also keeps the coherence_math.md aggregates:
+- kappa_eq: κ_eq = Σ(Ω_i − Δφ_i)/N
+- stable:   per-field stability condition |Δφ_i| ≤ Ω_i
+Both are computed once inside step(), so reading them is O(1).
+"""
+
+from __future__ import annotations
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from .fieldmap_quantara import FieldConfig, FieldState
+
+
+class FieldBank:
+    """
+    N coherence fields updated together.
+
+    Semantics per field are exactly those of QuantaraField.step(); a bank of
+    size 1 produces the same numbers as a single QuantaraField.
+    """
+
+    def __init__(self, size: int, cfg: Optional[FieldConfig] = None):
+        cfg = cfg or FieldConfig()
+        self._init_arrays(size)
+        self.ema_alpha[:] = cfg.ema_alpha
+        self.drift_sensitivity[:] = cfg.drift_sensitivity
+        self.gain_rate[:] = cfg.gain_rate
+        self.repair_bias[:] = cfg.repair_bias
+        self._decay[:] = 1.0 - self.ema_alpha
+
+    @classmethod
+    def from_configs(cls, configs: Sequence[FieldConfig]) -> "FieldBank":
+        """Build a bank with one (possibly distinct) FieldConfig per field."""
+        bank = cls.__new__(cls)
+        bank._init_arrays(len(configs))
+        for i, c in enumerate(configs):
+            bank.ema_alpha[i] = c.ema_alpha
+            bank.drift_sensitivity[i] = c.drift_sensitivity
+            bank.gain_rate[i] = c.gain_rate
+            bank.repair_bias[i] = c.repair_bias
+        bank._decay[:] = 1.0 - bank.ema_alpha
+        return bank
+
+    def _init_arrays(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("FieldBank needs at least one field")
+        self.size = size
+        # state (FieldState defaults)
+        self.t = np.zeros(size, dtype=np.int64)
+        self.kappa = np.ones(size)
+        self.delta_phi = np.zeros(size)
+        self.omega = np.zeros(size)
+        # per-field config
+        self.ema_alpha = np.empty(size)
+        self.drift_sensitivity = np.empty(size)
+        self.gain_rate = np.empty(size)
+        self.repair_bias = np.empty(size)
+        self._decay = np.empty(size)
+        # scratch + aggregates
+        self._s = np.empty(size)
+        self._tmp = np.empty(size)
+        self._stable = np.ones(size, dtype=bool)
+        self._kappa_eq = 0.0
+        self._stable_count = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    # ----- public API -----
+
+    def step(self, signals) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Advance every field one tick with its own signal_quality ∈ [0, 1].
+
+        `signals` is a length-N array (or a scalar broadcast to all fields).
+        Returns the live (kappa, delta_phi, omega) arrays — copy them if you
+        need to keep a tick around, the next step() overwrites them in place.
+        """
+        s, tmp = self._s, self._tmp
+        s[:] = signals
+        np.clip(s, 0.0, 1.0, out=s)
+
+        # 1) coherence trace: α·s + (1-α)·κ
+        np.multiply(self._decay, self.kappa, out=tmp)
+        np.multiply(self.ema_alpha, s, out=self.kappa)
+        self.kappa += tmp
+
+        # 2) deviation as the instantaneous shortfall
+        np.subtract(1.0, s, out=self.delta_phi)
+        self.delta_phi *= self.drift_sensitivity
+        np.clip(self.delta_phi, 0.0, 1.0, out=self.delta_phi)
+
+        # 3) recovery gain grows with drift, with background repair bias
+        np.multiply(self.delta_phi, self.gain_rate, out=self.omega)
+        self.omega += self.repair_bias
+        np.clip(self.omega, 0.0, 1.0, out=self.omega)
+
+        self.t += 1
+
+        # aggregates, computed once per tick so the accessors are O(1)
+        np.subtract(self.omega, self.delta_phi, out=tmp)
+        self._kappa_eq = float(tmp.mean())
+        np.greater_equal(tmp, 0.0, out=self._stable)  # Δφ ≥ 0, so |Δφ| ≤ Ω
+        self._stable_count = int(np.count_nonzero(self._stable))
+
+        return self.kappa, self.delta_phi, self.omega
+
+    def run(self, signals) -> np.ndarray:
+        """
+        Step through a (T, N) signal matrix; returns the κ_eq trace of length T.
+        """
+        signals = np.asarray(signals, dtype=np.float64)
+        out = np.empty(signals.shape[0])
+        for i, row in enumerate(signals):
+            self.step(row)
+            out[i] = self._kappa_eq
+        return out
+
+    @property
+    def kappa_eq(self) -> float:
+        """κ_eq = Σ(Ω_i − Δφ_i)/N as of the last step (0.0 before any step)."""
+        return self._kappa_eq
+
+    @property
+    def stable(self) -> np.ndarray:
+        """Boolean mask of fields meeting |Δφ| ≤ Ω (live, read-only by convention)."""
+        return self._stable
+
+    @property
+    def stable_count(self) -> int:
+        return self._stable_count
+
+    @property
+    def stable_fraction(self) -> float:
+        return self._stable_count / self.size
+
+    def state(self, i: int) -> FieldState:
+        """Snapshot of field i as a plain FieldState."""
+        return FieldState(
+            t=int(self.t[i]),
+            kappa=float(self.kappa[i]),
+            delta_phi=float(self.delta_phi[i]),
+            omega=float(self.omega[i]),
+        )
+
+    def config(self, i: int) -> FieldConfig:
+        return FieldConfig(
+            ema_alpha=float(self.ema_alpha[i]),
+            drift_sensitivity=float(self.drift_sensitivity[i]),
+            gain_rate=float(self.gain_rate[i]),
+            repair_bias=float(self.repair_bias[i]),
+        )
@@ -15,12 +15,14 @@ read the file in one sitting and understand exactly what it does.
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import Iterable, List, Tuple, Optional
-import json
 import math
 import time
-from pathlib import Path
 from statistics import fmean
 
+import numpy as np
+
+from .telemetry_sink import JsonlSink
+
 
 # ---------- helpers ----------
 
@@ -30,6 +32,39 @@ def _clip(x: float, lo: float = 0.0, hi: float = 1.0) -> float:
 def _ema(prev: float, x: float, alpha: float) -> float:
     return alpha * x + (1.0 - alpha) * prev
 
+# block length for the vectorized EMA; (1-α)^B stays well inside float64 range
+_EMA_BLOCK = 256
+
+def _ema_trace(x: np.ndarray, prev: float, alpha: float, block: int = _EMA_BLOCK) -> np.ndarray:
+    """
+    Vectorized EMA trace k_i = α·x_i + (1-α)·k_{i-1}, seeded with `prev`.
+
+    The series is cut into blocks of length B. Inside a block the recurrence
+    is a lower-triangular Toeplitz product (one GEMM for all blocks); the only
+    sequential work left is carrying one scalar across N/B block boundaries.
+    """
+    n = x.shape[0]
+    decay = 1.0 - alpha
+    nblocks = -(-n // block)
+    padded = np.zeros(nblocks * block)
+    padded[:n] = x
+    blocks = padded.reshape(nblocks, block)
+
+    j = np.arange(block)
+    lag = j[:, None] - j[None, :]
+    weights = np.where(lag >= 0, alpha * decay ** np.maximum(lag, 0), 0.0)
+    carry = decay ** (j + 1)
+
+    # block-local traces assuming a zero seed, then fold in the carried state
+    local = blocks @ weights.T
+    seeds = np.empty(nblocks)
+    k = prev
+    for b in range(nblocks):
+        seeds[b] = k
+        k = local[b, -1] + carry[-1] * k
+    out = local + seeds[:, None] * carry[None, :]
+    return out.reshape(-1)[:n]
+
 
 # ---------- core model ----------
 
@@ -62,12 +97,12 @@ class QuantaraField:
       - omega grows with drift (bounded), representing corrective pressure
     """
 
-    def __init__(self, cfg: Optional[FieldConfig] = None, log_path: Optional[str] = None):
+    def __init__(self, cfg: Optional[FieldConfig] = None, log_path: Optional[str] = None,
+                 sink: Optional[JsonlSink] = None):
         self.cfg = cfg or FieldConfig()
         self.state = FieldState()
-        self._log = Path(log_path) if log_path else None
-        if self._log:
-            self._log.parent.mkdir(parents=True, exist_ok=True)
+        # telemetry is buffered; pass a configured JsonlSink for rotation / background writes
+        self._sink = sink or (JsonlSink(log_path) if log_path else None)
 
     # ----- public API -----
 
@@ -96,7 +131,7 @@ class QuantaraField:
         st.omega = omega
 
         # optional JSONL telemetry for demos / audits
-        if self._log:
+        if self._sink:
             self._emit_jsonl(st)
 
         return st.kappa, st.delta_phi, st.omega
@@ -108,8 +143,110 @@ class QuantaraField:
             out.append(self.step(x))
         return out
 
+    def run_array(self, series) -> np.ndarray:
+        """
+        Vectorized runner: one pass over a whole array of signal qualities.
+
+        Returns an (N, 3) float64 array with columns (kappa, delta_phi, omega)
+        and leaves `self.state` exactly where N calls to step() would.
+        Δφ and Ω are bit-identical to step(); κ is computed in blocks, so it
+        differs from the sequential EMA only by float rounding (|err| < 1e-12).
+        Inputs are sanitised the same way: NaN reads as 1.0 (as in _clip) and
+        everything else is clipped to [0, 1].
+        """
+        s = np.asarray(series, dtype=np.float64).reshape(-1)
+        s = np.clip(np.where(np.isnan(s), 1.0, s), 0.0, 1.0)
+        n = s.shape[0]
+        out = np.empty((n, 3))
+        if n == 0:
+            return out
+        st, cfg = self.state, self.cfg
+
+        out[:, 0] = _ema_trace(s, st.kappa, cfg.ema_alpha)
+        out[:, 1] = np.clip((1.0 - s) * cfg.drift_sensitivity, 0.0, 1.0)
+        out[:, 2] = np.clip(cfg.repair_bias + (out[:, 1] * cfg.gain_rate), 0.0, 1.0)
+
+        t0 = st.t
+        st.t += n
+        st.kappa, st.delta_phi, st.omega = (float(v) for v in out[-1])
+
+        if self._sink:
+            self._emit_jsonl_array(t0, out)
+
+        return out
+
+    # ----- run-length fast-forward -----
+
+    def advance(self, signal_quality: float, count: int) -> Tuple[float, float, float]:
+        """
+        Equivalent to `count` calls of step(signal_quality), in O(1).
+
+        For a constant input the EMA has the closed form
+            κ_n = s + (κ_0 − s)·(1 − α)^n
+        and Δφ, Ω do not depend on history. κ agrees with stepping up to float
+        rounding (|err| < 1e-12); Δφ and Ω are bit-identical. With logging on,
+        one record is emitted at the end of the run rather than one per tick.
+        """
+        if count < 0:
+            raise ValueError("count must be >= 0")
+        st = self.state
+        if count == 0:
+            return st.kappa, st.delta_phi, st.omega
+        if count == 1:
+            return self.step(signal_quality)
+
+        s = _clip(signal_quality)
+        cfg = self.cfg
+        decay = (1.0 - cfg.ema_alpha) ** count
+        st.kappa = s + (st.kappa - s) * decay
+        st.delta_phi = _clip((1.0 - s) * cfg.drift_sensitivity)
+        st.omega = _clip(cfg.repair_bias + (st.delta_phi * cfg.gain_rate))
+        st.t += count
+
+        if self._sink:
+            self._emit_jsonl(st)
+
+        return st.kappa, st.delta_phi, st.omega
+
+    def run_rle(self, runs: Iterable[Tuple[float, int]]) -> np.ndarray:
+        """
+        Replay a run-length encoded series of (value, count) pairs.
+        Returns an (R, 3) array holding the triad at the end of each run.
+        """
+        out = [self.advance(v, int(c)) for v, c in runs]
+        return np.array(out, dtype=np.float64).reshape(-1, 3)
+
+    def run_compressed(self, series) -> np.ndarray:
+        """Detect constant runs in `series` and replay them with run_rle()."""
+        values, counts = encode_runs(series)
+        return self.run_rle(zip(values.tolist(), counts.tolist()))
+
     # ----- logging -----
 
+    def close(self) -> None:
+        """Flush and close the telemetry sink, if any."""
+        if self._sink:
+            self._sink.close()
+
+    def __enter__(self) -> "QuantaraField":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _emit_jsonl_array(self, t0: int, trace: np.ndarray) -> None:
+        ts = time.time()
+        self._sink.write_many(
+            {
+                "ts": ts,
+                "t": t0 + i + 1,
+                "kappa": round(k, 6),
+                "delta_phi": round(d, 6),
+                "omega": round(o, 6),
+            }
+            for i, (k, d, o) in enumerate(trace.tolist())
+        )
+
     def _emit_jsonl(self, st: FieldState) -> None:
         payload = {
             "ts": time.time(),
@@ -118,22 +255,33 @@ class QuantaraField:
             "delta_phi": round(st.delta_phi, 6),
             "omega": round(st.omega, 6),
         }
-        with self._log.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(payload) + "\n")
+        self._sink.write(payload)
+
+
+def encode_runs(series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run-length encode a signal series after clipping to [0, 1].
+    Returns (values, counts); values that clip to the same number share a run.
+    """
+    s = np.clip(np.asarray(series, dtype=np.float64).reshape(-1), 0.0, 1.0)
+    if s.size == 0:
+        return s, np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], s[1:] != s[:-1])))
+    counts = np.diff(np.append(starts, s.size))
+    return s[starts], counts
 
 
 # ---------- quick demo ----------
 
 if __name__ == "__main__":
     """
-    Run: python coherence_field/quantara_fieldmap.py
+    Run: python -m coherence_field.fieldmap_quantara  (from src/quantara_core)
     A tiny sanity check that prints a few ticks and writes JSONL if a path is given.
     """
-    field = QuantaraField(log_path="quantara_instrumentation/out/field_trace.jsonl")
-
     # toy signal: clean → noisy → recovery
     toy = [0.95]*10 + [0.6, 0.55, 0.5, 0.45, 0.5, 0.6] + [0.7, 0.8, 0.9, 0.95]
 
-    for x in toy:
-        k, d, o = field.step(x)
-        print(f"t={field.state.t:02d}  κ={k:.3f}  Δφ={d:.3f}  Ω={o:.3f}")
+    with QuantaraField(log_path="quantara_instrumentation/out/field_trace.jsonl") as field:
+        for x in toy:
+            k, d, o = field.step(x)
+            print(f"t={field.state.t:02d}  κ={k:.3f}  Δφ={d:.3f}  Ω={o:.3f}")
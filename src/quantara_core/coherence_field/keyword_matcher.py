@@ -0,0 +1,86 @@
+"""
+Quantara Keyword Matcher
+------------------------
+Compiled multi-pattern matcher for the scorer's ethical keyword bonus.
+
+All keywords are folded into one regex alternation (longest first, so a
+hit at a position is always the longest keyword starting there). A
+document is lowercased and scanned once; match offsets are mapped back
+to sentences with a binary search. Matchers are cached per keyword set.
+
+Semantics are those of the original check: a sentence hits when any
+keyword is a case-insensitive substring of it.
+"""
+
+from __future__ import annotations
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, Iterable, List, Sequence, Tuple
+import re
+
+_SEP = "\x00"
+
+
+class KeywordMatcher:
+    """Matches a fixed keyword set against lists of sentences."""
+
+    def __init__(self, keywords: Iterable[str]):
+        kws = sorted({k.lower() for k in keywords}, key=lambda k: (-len(k), k))
+        # an empty keyword is a substring of every sentence
+        self.match_all = "" in kws
+        self.keywords: Tuple[str, ...] = tuple(k for k in kws if k)
+        self._pattern = re.compile("|".join(map(re.escape, self.keywords))) if self.keywords else None
+        self._lookahead = re.compile(f"(?=({self._pattern.pattern}))") if self._pattern else None
+        # keywords that also match wherever a longer keyword matches (its keyword prefixes)
+        self._implied: Dict[str, Tuple[str, ...]] = {
+            k: tuple(p for p in self.keywords if p != k and k.startswith(p)) for k in self.keywords
+        }
+
+    def _scan_text(self, sentences: Sequence[str]) -> Tuple[str, List[int]]:
+        lowered = [s.lower() for s in sentences]
+        # start offset of each sentence inside the joined text
+        starts = [0] + list(accumulate(len(s) + 1 for s in lowered))[:-1]
+        return _SEP.join(lowered), starts
+
+    def sentence_hits(self, sentences: Sequence[str]) -> int:
+        """Number of sentences containing at least one keyword."""
+        if self.match_all:
+            return len(sentences)
+        if self._pattern is None or not sentences:
+            return 0
+        text, starts = self._scan_text(sentences)
+        hit, pos, n = 0, 0, len(sentences)
+        search = self._pattern.search
+        while True:
+            m = search(text, pos)
+            if m is None:
+                return hit
+            hit += 1
+            idx = bisect_right(starts, m.start())
+            if idx >= n:
+                return hit
+            pos = starts[idx]  # skip the rest of a sentence that already hit
+
+    def keyword_counts(self, sentences: Sequence[str]) -> Dict[str, int]:
+        """Occurrences of each keyword (overlaps included) across all sentences."""
+        counts = dict.fromkeys(self.keywords, 0)
+        if self._lookahead is None or not sentences:
+            return counts
+        text, _ = self._scan_text(sentences)
+        for m in self._lookahead.finditer(text):
+            kw = m.group(1)
+            counts[kw] += 1
+            for p in self._implied[kw]:
+                counts[p] += 1
+        return counts
+
+
+@lru_cache(maxsize=128)
+def _cached_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def compile_keywords(keywords: Iterable[str]) -> KeywordMatcher:
+    """Build (or fetch the cached) matcher for a keyword set."""
+    return _cached_matcher(tuple(keywords))
@@ -1,9 +1,54 @@
 import numpy as np
-import torch
-from sentence_transformers import SentenceTransformer, util
-from typing import Dict, List
+from typing import Dict, Iterable, List, Sequence, Tuple
 import re
-from .quantara_fieldmap import QuantaraField  # Import actual class for practical impl
+from .fieldmap_quantara import QuantaraField  # Import actual class for practical impl
+from .embedding_cache import EmbeddingCache
+from .embedding_backends import EmbeddingBackend, make_backend
+from .keyword_matcher import compile_keywords
+
+_SENTENCE_SPLIT = re.compile(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?)\s')
+
+SCORING_MODES = ('consecutive', 'lag', 'window', 'centroid')
+
+
+def _unit_rows(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+def signal_series(embeddings: np.ndarray, mode: str = 'consecutive',
+                  lag: int = 1, window: int = 3) -> np.ndarray:
+    """
+    Signal-quality series for one document from its unit-normalized embeddings.
+
+    - consecutive: cos(e_i, e_{i-1})
+    - lag:         cos(e_i, e_{i-k}), k = lag (capped at n-1)
+    - window:      cos(e_i, mean(e_{i-w}..e_{i-1})), w = window, via prefix sums
+    - centroid:    cos(e_i, document centroid) for every sentence
+    Every mode is O(n·d); documents with < 2 sentences map to [1.0].
+    """
+    n = embeddings.shape[0]
+    if n < 2:
+        return np.ones(1)
+    if mode == 'consecutive':
+        lag, mode = 1, 'lag'
+    if mode == 'lag':
+        k = max(1, min(lag, n - 1))
+        sims = np.einsum('ij,ij->i', embeddings[:-k], embeddings[k:])
+    elif mode == 'window':
+        w = max(1, window)
+        csum = np.zeros((n + 1, embeddings.shape[1]), dtype=np.float64)
+        np.cumsum(embeddings, axis=0, out=csum[1:])
+        i = np.arange(1, n)
+        prev = _unit_rows(csum[i] - csum[np.maximum(0, i - w)])
+        sims = np.einsum('ij,ij->i', embeddings[1:], prev)
+    elif mode == 'centroid':
+        centroid = _unit_rows(embeddings.mean(axis=0, keepdims=True))[0]
+        sims = embeddings @ centroid
+    else:
+        raise ValueError(f"unknown scoring mode {mode!r}; expected one of {SCORING_MODES}")
+    return np.clip(sims, 0.0, 1.0)
 
 class LLMCoherenceScorer:
     """
@@ -12,37 +57,87 @@ class LLMCoherenceScorer:
     Ties to coherence_math.md: Uses field to approximate dκ/dt = f(Ω - Δφ) via EMA,
     κ_eq as avg triad, and checks |Δφ| ≤ Ω for flag.
     Usage: scorer = LLMCoherenceScorer(); result = scorer.score("LLM text")
+    Pass cache=EmbeddingCache(...) to reuse embeddings of repeated sentences.
+    Pass backend=... (or set QUANTARA_EMBEDDING_BACKEND) to swap the encoder; the
+    default MiniLM model comes from the shared embedder registry, loaded on first use.
     """
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
-        self.embedder = SentenceTransformer(model_name)
-        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
-        self.embedder.to(self.device)
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', cache: EmbeddingCache = None,
+                 device: str = None, backend: EmbeddingBackend = None):
+        self.model_name = model_name
+        self.cache = cache
+        self.backend = backend or make_backend(model_name=model_name, device=device)
+        # keys are scoped by backend so a shared cache never mixes vector spaces
+        self.cache_namespace = None
+        if cache is not None:
+            self.cache_namespace = (f"{cache.namespace}|{self.backend.name}" if cache.namespace
+                                    else self.backend.name)
+
+    @property
+    def device(self) -> str:
+        return getattr(self.backend, 'device', 'cpu')
 
-    def _split_sentences(self, text: str) -> List[str]:
-        return [s.strip() for s in re.split(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?)\s', text) if s.strip()]
+    @property
+    def embedder(self):
+        return getattr(self.backend, 'model', None)
+
+    @staticmethod
+    def _split_sentences(text: str) -> List[str]:
+        return [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+
+    def _encode(self, sentences: Sequence[str], batch_size: int = 64) -> np.ndarray:
+        """Unit-normalized float32 embeddings, one row per sentence."""
+        def encode(batch: List[str]) -> np.ndarray:
+            return self.backend.encode(batch, batch_size=batch_size)
+        if self.cache is not None:
+            return self.cache.encode(sentences, encode, namespace=self.cache_namespace)
+        return encode(list(sentences))
+
+    @staticmethod
+    def _rowwise_cos(embeddings: np.ndarray) -> np.ndarray:
+        """cos_sim(e[i-1], e[i]) for every i ≥ 1 as one row-wise dot product."""
+        return np.clip(np.einsum('ij,ij->i', embeddings[:-1], embeddings[1:]), 0.0, 1.0)
 
     def _consecutive_similarities(self, sentences: List[str]) -> List[float]:
         """Compute cos_sim between consecutive sentences as signal_quality series."""
         if len(sentences) < 2:
             return [1.0]  # Perfect if single sentence
-        embeddings = self.embedder.encode(sentences, convert_to_tensor=True, device=self.device)
-        sims = []
-        for i in range(1, len(sentences)):
-            sim = util.cos_sim(embeddings[i-1:i], embeddings[i:i+1]).cpu().numpy()[0][0]
-            sims.append(float(np.clip(sim, 0.0, 1.0)))
-        return sims
-
-    def score(self, llm_output: str, ethical_keywords: List[str] = None) -> Dict[str, float]:
-        sentences = self._split_sentences(llm_output)
-        signal_series = self._consecutive_similarities(sentences)
-
-        # Run QuantaraField over series (approximates dκ/dt = f(Ω - Δφ) from coherence_math.md)
-        field = QuantaraField()  # New instance; no log
-        trace = field.run(signal_series)
-        if trace:
-            final_k, final_d, final_o = trace[-1]  # Final triad (κ, Δφ, Ω)
-        else:
-            final_k, final_d, final_o = 1.0, 0.0, 0.0
+        return self._rowwise_cos(self._encode(sentences)).tolist()
+
+    def _batched_similarities(self, docs: List[List[str]], batch_size: int,
+                              max_sentences: int, mode: str = 'consecutive',
+                              lag: int = 1, window: int = 3) -> Iterable[np.ndarray]:
+        """
+        Yield each document's signal series, encoding sentences of many documents
+        together. Documents are grouped so that at most `max_sentences` sentences
+        (and their embeddings) are held at once.
+        """
+        group: List[List[str]] = []
+        pending = 0
+        for doc in docs + [None]:
+            if doc is not None and (not group or pending + len(doc) <= max_sentences):
+                group.append(doc)
+                pending += len(doc)
+                continue
+            flat = [s for d in group for s in d]
+            emb = self._encode(flat, batch_size) if len(flat) > 1 else None
+            # consecutive mode: one row-wise dot over the whole group
+            sims = self._rowwise_cos(emb) if emb is not None and mode == 'consecutive' else None
+            start = 0
+            for d in group:
+                n = len(d)
+                if n < 2:
+                    yield np.ones(1)
+                elif sims is not None:
+                    # pair (i-1, i) inside the doc lives at sims[start + i - 1]; cross-doc pairs are skipped
+                    yield sims[start:start + n - 1]
+                else:
+                    yield signal_series(emb[start:start + n], mode, lag, window)
+                start += n
+            group, pending = ([doc], len(doc)) if doc is not None else ([], 0)
+
+    def _summarize(self, sentences: List[str], triad: Tuple[float, float, float],
+                   ethical_keywords: List[str] = None) -> Dict[str, float]:
+        final_k, final_d, final_o = triad
 
         # Invert Δφ for positive metric (deviation divergence)
         inv_delta_phi = 1.0 - final_d
@@ -50,7 +145,7 @@ class LLMCoherenceScorer:
         # Ethical bonus (alignment to Quantara principles)
         ethical_bonus = 0.0
         if ethical_keywords:
-            matches = sum(1 for s in sentences if any(kw.lower() in s.lower() for kw in ethical_keywords))
+            matches = compile_keywords(ethical_keywords).sentence_hits(sentences)
             ethical_bonus = min(matches / len(sentences), 0.2) if sentences else 0.0
 
         # Overall: Approx κ_eq = Σ(Ω_i - Δφ_i)/N from coherence_math.md + bonus
@@ -70,6 +165,39 @@ class LLMCoherenceScorer:
             'flag': flag
         }
 
+    def score(self, llm_output: str, ethical_keywords: List[str] = None,
+              mode: str = 'consecutive', lag: int = 1, window: int = 3) -> Dict[str, float]:
+        return self.score_many([llm_output], ethical_keywords=ethical_keywords,
+                               mode=mode, lag=lag, window=window)[0]
+
+    def score_many(self, texts: Sequence[str], ethical_keywords: List[str] = None,
+                   batch_size: int = 64, max_sentences: int = 8192,
+                   mode: str = 'consecutive', lag: int = 1, window: int = 3) -> List[Dict[str, float]]:
+        """
+        Score many documents at once; results match score() per document.
+
+        All sentences of up to `max_sentences` are embedded in one encode() call
+        (in chunks of `batch_size`), consecutive similarities come from a single
+        row-wise dot product, and each series runs through QuantaraField.run_array.
+        `mode` selects the drift signal (see signal_series): 'consecutive',
+        'lag' (k = lag), 'window' (w = window) or 'centroid'.
+        """
+        if mode not in SCORING_MODES:
+            raise ValueError(f"unknown scoring mode {mode!r}; expected one of {SCORING_MODES}")
+        docs = [self._split_sentences(t) for t in texts]
+        results = []
+        batches = self._batched_similarities(docs, batch_size, max_sentences, mode, lag, window)
+        for sentences, series in zip(docs, batches):
+            # Run QuantaraField over series (approximates dκ/dt = f(Ω - Δφ) from coherence_math.md)
+            trace = QuantaraField().run_array(series)  # New instance; no log
+            results.append(self._summarize(sentences, tuple(float(v) for v in trace[-1]), ethical_keywords))
+        return results
+
+    def stream(self):
+        """Open an incremental session that scores text as it streams in."""
+        from .coherence_stream import CoherenceStream
+        return CoherenceStream(self)
+
 if __name__ == "__main__":
     scorer = LLMCoherenceScorer()
     sample = "The sky is blue. Water is wet. Apples are red. Ethical AI recovers coherence."
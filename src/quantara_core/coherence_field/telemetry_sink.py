@@ -0,0 +1,225 @@
+"""
+Quantara Telemetry Sink
+-----------------------
+Buffered JSONL writer for coherence telemetry.
+
+QuantaraField used to open, append and close its log on every tick.
+JsonlSink keeps one handle open, collects records in memory and writes
+them in batches:
+
+- flush when `flush_records` records are pending or `flush_interval`
+  seconds have passed since the last flush, and on close(), garbage
+  collection or interpreter exit
+- rotate the active file once it grows past `max_bytes`, optionally
+  gzipping the finished segment
+- optionally hand batches to a background writer thread so the caller
+  (typically QuantaraField.step) never waits on disk
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+import gzip
+import json
+import queue
+import shutil
+import threading
+import time
+import weakref
+
+
+class _SegmentWriter:
+    """Owns the open log file: appends batches and rotates past max_bytes."""
+
+    def __init__(self, path: Path, max_bytes: Optional[int], compress: bool):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.fh = path.open("a", encoding="utf-8")
+        self.size = self.fh.tell()
+        self.segment = self._next_segment_index()
+
+    def write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        data = "".join(json.dumps(r) + "\n" for r in batch)
+        self.fh.write(data)
+        self.fh.flush()
+        self.size += len(data.encode("utf-8"))
+        if self.max_bytes and self.size >= self.max_bytes:
+            self._rotate()
+
+    def close(self) -> None:
+        self.fh.close()
+
+    def _segment_path(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{index:05d}{self.path.suffix}")
+
+    def _next_segment_index(self) -> int:
+        index = 1
+        while (self._segment_path(index).exists() or
+               self._segment_path(index).with_name(self._segment_path(index).name + ".gz").exists()):
+            index += 1
+        return index
+
+    def _rotate(self) -> None:
+        self.fh.close()
+        target = self._segment_path(self.segment)
+        self.segment += 1
+        self.path.replace(target)
+        if self.compress:
+            with target.open("rb") as src, gzip.open(f"{target}.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            target.unlink()
+        self.fh = self.path.open("a", encoding="utf-8")
+        self.size = 0
+
+
+def _shutdown(buf: List[Dict[str, Any]], lock: threading.Lock, writer: _SegmentWriter,
+              q: Optional[queue.Queue], thread: Optional[threading.Thread]) -> None:
+    # Runs from close(), when the sink is garbage-collected, or at interpreter
+    # exit, whichever comes first. Must not reference the sink itself.
+    if q is not None:
+        q.put(None)  # the writer thread drains queued batches before stopping
+        thread.join()
+    with lock:
+        batch = buf[:]
+        buf.clear()
+    try:
+        if batch:
+            writer.write_batch(batch)
+    finally:
+        writer.close()
+
+
+class JsonlSink:
+    """
+    Batched, rotating JSONL writer. Use as a context manager or call close();
+    a sink that is simply dropped is flushed and closed when it is
+    garbage-collected (or at interpreter exit).
+
+    In the default synchronous mode `flush_interval` is only checked when a
+    record is written, so an idle sink keeps up to `flush_records - 1`
+    records pending until the next write, flush() or close(). Pass
+    background=True for wall-clock flushing; a background sink's writer
+    thread keeps it alive until close() or interpreter exit.
+
+    A failed background write (disk full, EIO) drops that batch but keeps
+    the writer running; the next flush() or close() raises it as an
+    OSError. Writing to a closed sink raises ValueError.
+    """
+
+    def __init__(self, path: str,
+                 flush_records: int = 512,
+                 flush_interval: float = 1.0,
+                 max_bytes: Optional[int] = None,
+                 compress: bool = False,
+                 background: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_records = max(1, flush_records)
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.compress = compress
+
+        # _buf is only ever mutated in place: the finalizer holds it too
+        self._buf: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._error: Optional[BaseException] = None  # first unreported background failure
+        self._writer = _SegmentWriter(self.path, max_bytes, compress)
+
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(target=self._writer_loop,
+                                            name="quantara-jsonl-sink", daemon=True)
+            self._thread.start()
+
+        self._finalizer = weakref.finalize(self, _shutdown, self._buf, self._lock,
+                                           self._writer, self._queue, self._thread)
+
+    # ----- public API -----
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Queue one record; flushes if a size or time threshold is hit."""
+        self._check_open()
+        with self._lock:
+            self._buf.append(record)
+            due = (len(self._buf) >= self.flush_records or
+                   time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self._flush(wait=False)
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        self._check_open()
+        with self._lock:
+            self._buf.extend(records)
+        self._flush(wait=False)
+
+    def flush(self) -> None:
+        """Write everything pending (and, in background mode, wait for the writer)."""
+        self._check_open()
+        self._flush(wait=True)
+        self._raise_error()
+
+    def close(self) -> None:
+        if self._finalizer.alive:
+            self._finalizer()
+            self._raise_error()
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ----- internals -----
+
+    def _check_open(self) -> None:
+        if not self._finalizer.alive:
+            raise ValueError(f"write to closed JsonlSink ({self.path})")
+
+    def _raise_error(self) -> None:
+        err, self._error = self._error, None
+        if err is not None:
+            raise OSError(f"JsonlSink background write to {self.path} failed: {err}") from err
+
+    def _flush(self, wait: bool) -> None:
+        with self._lock:
+            batch = self._buf[:]
+            self._buf.clear()
+            self._last_flush = time.monotonic()
+        if self._queue is None:
+            if batch:
+                self._writer.write_batch(batch)
+            return
+        if batch:
+            self._queue.put(batch)
+        if wait:
+            if not self._thread.is_alive():
+                raise RuntimeError("JsonlSink writer thread is not running")
+            self._queue.join()
+
+    def _writer_loop(self) -> None:
+        while True:
+            try:
+                batch = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                # idle tick: push out records that have been waiting too long
+                if self._buf and time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._flush(wait=False)
+                continue
+            try:
+                if batch is None:
+                    return
+                self._writer.write_batch(batch)
+            except Exception as exc:
+                # keep draining so task_done stays balanced; flush()/close() report it
+                if self._error is None:
+                    self._error = exc
+            finally:
+                self._queue.task_done()
@@ -42,7 +42,8 @@ Design Notes
 ------------
 • No external libraries. Pure Python.
 • Deterministic, auditable scores with clear math.
-• Memory strata: episodic, semantic, commitments (τ-ledger).
+• Memory strata: episodic (bounded ring, compacted into semantic
+  aggregates), semantic, commitments (τ-ledger).
 • Instruments: Coherence Credit (CCE), Coherence Rebate (CRB),
   Temporal Equity Bond (TEB) — represented as computed incentives.
 • Right to Audit: every decision produces a provenance trail
@@ -54,11 +55,17 @@ as the living reference implementation inside quantara-core.
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 import math
 import time
 
 
+# Words that mark a query as plan-shaped in π feature extraction.
+PLAN_WORDS = ("plan", "roadmap", "phase", "deploy", "invest")
+
+
 # --------- Data structures ----------------------------------------------------
 
 @dataclass
@@ -139,6 +146,31 @@ class CoherenceMeter:
         # Weighted risk aggregation.
         return max(0.0, min(1.0, 0.5*i + 0.3*o + 0.2*e))
 
+    # Batch forms. Within one batch the engine-level terms (values, ledger)
+    # are shared, so each formula is evaluated once per distinct per-item
+    # input and fanned out as a column. Results equal the scalar calls
+    # exactly, because they are the scalar calls.
+
+    @classmethod
+    def kappa_alignment_many(cls, signal_quality: Sequence[float],
+                             reciprocity: float,
+                             circularity: float) -> List[float]:
+        memo: Dict[float, float] = {}
+        for s in signal_quality:
+            if s not in memo:
+                memo[s] = cls.kappa_alignment(s, reciprocity, circularity)
+        return [memo[s] for s in signal_quality]
+
+    @classmethod
+    def sigma_drift_many(cls, instability: Sequence[float],
+                         opacity: float,
+                         externality_unpriced: float) -> List[float]:
+        memo: Dict[float, float] = {}
+        for i in instability:
+            if i not in memo:
+                memo[i] = cls.sigma_drift(i, opacity, externality_unpriced)
+        return [memo[i] for i in instability]
+
 
 # --------- Ethical guard and auditability ------------------------------------
 
@@ -147,9 +179,21 @@ class EthicalGuard:
     Enforces Quantara-aligned constraints and provides an audit trail.
 
     Rules are simple predicates over observations and candidate outputs.
+
+    The audit log is unbounded by default (one entry per check). Pass
+    `audit_capacity` to cap it: once it is exceeded, the oldest quarter of
+    the entries is handed to `audit_export` (if given, e.g. to append them
+    to a file) and dropped, and `audit_exported` counts how many have left.
+    drain_audit() streams entries out on the host's own schedule.
     """
 
-    def __init__(self):
+    def __init__(self, audit_capacity: Optional[int] = None,
+                 audit_export: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        if audit_capacity is not None and audit_capacity < 1:
+            raise ValueError("audit_capacity must be >= 1")
+        self.audit_capacity = audit_capacity
+        self.audit_export = audit_export
+        self.audit_exported = 0
         self.audit_log: List[Dict[str, Any]] = []
 
     def check(self, obs: Observation, draft: str,
@@ -175,51 +219,227 @@ class EthicalGuard:
             "decision": "pass" if passed else "revise",
             "notes": notes,
         })
+        if self.audit_capacity is not None and len(self.audit_log) > self.audit_capacity:
+            self.drain_audit(max(1, self.audit_capacity // 4))
         return passed, notes
 
     def right_to_audit(self) -> List[Dict[str, Any]]:
         """Expose immutable audit entries."""
         return list(self.audit_log)
 
+    def drain_audit(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Remove and return the `n` oldest entries (all by default), passing them to audit_export."""
+        n = len(self.audit_log) if n is None else min(n, len(self.audit_log))
+        batch = self.audit_log[:n]
+        del self.audit_log[:n]
+        self.audit_exported += len(batch)
+        if batch and self.audit_export is not None:
+            self.audit_export(batch)
+        return batch
+
 
 # --------- Memory strata ------------------------------------------------------
 
+class EpisodicStore:
+    """
+    Bounded episodic memory: a ring buffer of the most recent `capacity`
+    episodes with one array('d') column per feature, so an episode costs a
+    few doubles plus its summary string instead of a dict per observation.
+
+    When the ring is full the oldest `compact_batch` episodes are folded
+    into fixed-size aggregates (count, time span, per-feature sum/min/max)
+    and dropped, so memory stays flat however long the engine runs.
+
+    Reads look like the old list of dicts: len(), iteration oldest first,
+    and indexing/slicing that return {"t", "features", "summary"} dicts.
+    """
+
+    def __init__(self, capacity: int = 4096, compact_batch: Optional[int] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.compact_batch = max(1, min(capacity, compact_batch or capacity // 4 or 1))
+        self._t = array("d", [0.0]) * capacity
+        self._features: Dict[str, array] = {}
+        self._summary: List[Optional[str]] = [None] * capacity
+        self._head = 0  # slot of the oldest episode
+        self._size = 0
+        # aggregates of every compacted episode
+        self.compacted = 0
+        self.t_first: Optional[float] = None
+        self.t_last: Optional[float] = None
+        self.feature_stats: Dict[str, Dict[str, float]] = {}
+
+    def append(self, t: float, features: Dict[str, float], summary: str) -> int:
+        """Store one episode; returns how many old episodes were compacted to make room."""
+        compacted = 0
+        if self._size == self.capacity:
+            compacted = self.compact(self.compact_batch)
+        slot = (self._head + self._size) % self.capacity
+        self._t[slot] = t
+        for name, v in features.items():
+            col = self._features.get(name)
+            if col is None:
+                col = self._features[name] = array("d", [math.nan]) * self.capacity
+            col[slot] = float(v)
+        for name, col in self._features.items():
+            if name not in features:
+                col[slot] = math.nan
+        self._summary[slot] = summary
+        self._size += 1
+        return compacted
+
+    def compact(self, n: int) -> int:
+        """Fold the `n` oldest episodes into the aggregates and free their slots."""
+        n = min(n, self._size)
+        for k in range(n):
+            slot = (self._head + k) % self.capacity
+            t = self._t[slot]
+            self.t_first = t if self.t_first is None else min(self.t_first, t)
+            self.t_last = t if self.t_last is None else max(self.t_last, t)
+            for name, col in self._features.items():
+                v = col[slot]
+                if v != v:  # NaN: feature absent in this episode
+                    continue
+                st = self.feature_stats.get(name)
+                if st is None:
+                    self.feature_stats[name] = {"count": 1, "sum": v, "min": v, "max": v}
+                else:
+                    st["count"] += 1
+                    st["sum"] += v
+                    st["min"] = min(st["min"], v)
+                    st["max"] = max(st["max"], v)
+            self._summary[slot] = None
+        self.compacted += n
+        self._head = (self._head + n) % self.capacity
+        self._size -= n
+        return n
+
+    def summary(self) -> Dict[str, Any]:
+        """Semantic digest of compacted history (means rather than raw sums)."""
+        return {
+            "episodes": self.compacted,
+            "t_first": self.t_first,
+            "t_last": self.t_last,
+            "features": {name: {"mean": st["sum"] / st["count"], "min": st["min"], "max": st["max"]}
+                         for name, st in self.feature_stats.items()},
+        }
+
+    def _episode(self, k: int) -> Dict[str, Any]:
+        slot = (self._head + k) % self.capacity
+        features = {}
+        for name, col in self._features.items():
+            v = col[slot]
+            if v == v:
+                features[name] = v
+        return {"t": self._t[slot], "features": features, "summary": self._summary[slot]}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self._episode(k) for k in range(self._size))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._episode(k) for k in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("episode index out of range")
+        return self._episode(index)
+
+
 class Memory:
-    """Three strata: episodic, semantic, commitments."""
+    """
+    Three strata: episodic (bounded, see EpisodicStore), semantic,
+    commitments. Compacted episodes surface in
+    semantic["episodic_history"].
+
+    The commitment ledger keeps running aggregates so τ never rescans it:
+    a kept-ratio sum (re-summed exactly once per len(ledger) updates, so
+    float drift stays bounded) and a due-date index sorted on
+    (due_years, cid) with bisect, whose last entry is the horizon. Change commitments through
+    record_commitment / update_commitment to keep them in step.
+
+    Bounding memory does not bound the engine: CIEngine also keeps one
+    EthicalGuard audit entry (with the observation's features) per check,
+    and that log is unbounded unless the engine is built with
+    `audit_capacity` or the host calls guard.drain_audit().
+    """
 
-    def __init__(self):
-        self.episodic: List[Dict[str, Any]] = []
+    def __init__(self, episodic_capacity: int = 4096):
+        self.episodic = EpisodicStore(episodic_capacity)
         self.semantic: Dict[str, Any] = {}
         # commitments store τ-ledger entries: {id: {promise, due, status}}
         self.commitments: Dict[str, Dict[str, Any]] = {}
+        self._kept_sum = 0.0
+        self._updates = 0
+        # parallel lists sorted by (due_years, cid); ties ordered by id
+        self._due_years: List[float] = []
+        self._due_ids: List[str] = []
 
     def add_episode(self, obs: Observation, summary: str) -> None:
-        self.episodic.append({
-            "t": obs.timestamp,
-            "features": obs.features,
-            "summary": summary,
-        })
+        if self.episodic.append(obs.timestamp, obs.features, summary):
+            self.upsert_semantic("episodic_history", self.episodic.summary())
 
     def upsert_semantic(self, key: str, value: Any) -> None:
         self.semantic[key] = value
 
     def record_commitment(self, cid: str, promise: str,
                           due_years: float) -> None:
+        old = self.commitments.get(cid)
+        if old is not None:
+            self._kept_sum -= old["kept"]
+            self._unindex_due(cid, old["due_years"])
         self.commitments[cid] = {
             "promise": promise,
             "due_years": due_years,
             "kept": 0.0,  # ratio 0..1 updated over time
             "created_t": time.time(),
         }
+        i = self._due_slot(cid, due_years)
+        self._due_years.insert(i, due_years)
+        self._due_ids.insert(i, cid)
+        self._touch()
 
     def update_commitment(self, cid: str, kept_ratio: float) -> None:
         if cid in self.commitments:
-            self.commitments[cid]["kept"] = max(0.0, min(1.0, kept_ratio))
+            entry = self.commitments[cid]
+            kept = max(0.0, min(1.0, kept_ratio))
+            self._kept_sum += kept - entry["kept"]
+            entry["kept"] = kept
+            self._touch()
 
     def obligations_met_ratio(self) -> float:
         if not self.commitments:
             return 0.0
-        return sum(c["kept"] for c in self.commitments.values()) / len(self.commitments)
+        return self._kept_sum / len(self.commitments)
+
+    def max_due_years(self) -> float:
+        """Furthest due date in the ledger (the τ horizon), 0.0 when empty."""
+        return self._due_years[-1] if self._due_years else 0.0
+
+    def due_within(self, years: float) -> List[str]:
+        """Ids of commitments due within `years`, soonest first."""
+        return self._due_ids[:bisect_right(self._due_years, years)]
+
+    def _due_slot(self, cid: str, due_years: float) -> int:
+        # bisect the due_years tie range, then the ids inside it
+        lo = bisect_left(self._due_years, due_years)
+        hi = bisect_right(self._due_years, due_years, lo)
+        return bisect_left(self._due_ids, cid, lo, hi)
+
+    def _unindex_due(self, cid: str, due_years: float) -> None:
+        i = self._due_slot(cid, due_years)
+        del self._due_years[i]
+        del self._due_ids[i]
+
+    def _touch(self) -> None:
+        self._updates += 1
+        if self._updates >= len(self.commitments):
+            self._kept_sum = math.fsum(c["kept"] for c in self.commitments.values())
+            self._updates = 0
 
 
 # --------- CI Engine ----------------------------------------------------------
@@ -232,11 +452,19 @@ class CIEngine:
     - expand()    → e
     """
 
-    def __init__(self, system_id: str = "quantara-core"):
+    PILLARS = (
+        "Coherence-first reasoning with audit trail",
+        "Energy-aware and circular-by-default planning",
+        "Temporal duties and milestones with public check-ins",
+    )
+
+    def __init__(self, system_id: str = "quantara-core", episodic_capacity: int = 4096,
+                 audit_capacity: Optional[int] = None,
+                 audit_export: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
         self.system_id = system_id
         self.meter = CoherenceMeter()
-        self.guard = EthicalGuard()
-        self.memory = Memory()
+        self.guard = EthicalGuard(audit_capacity, audit_export)
+        self.memory = Memory(episodic_capacity)
 
         # Default semantic anchors (can be tuned by project)
         self.memory.upsert_semantic("values", {
@@ -258,8 +486,7 @@ class CIEngine:
 
         # Very light, deterministic scoring features.
         length = len(text.strip())
-        has_plan_words = any(w in text.lower() for w in
-                             ["plan", "roadmap", "phase", "deploy", "invest"])
+        has_plan_words = any(w in text.lower() for w in PLAN_WORDS)
         urgency = 1.0 if "urgent" in text.lower() else 0.4
 
         features = {
@@ -278,6 +505,31 @@ class CIEngine:
         )
         return obs
 
+    def perceive_many(self, inputs: Sequence[Dict[str, Any]],
+                      context: Optional[Dict[str, Any]] = None) -> List[Observation]:
+        """
+        Batch π: same features as perceive(), extracted column by column
+        for the whole batch. All observations share one timestamp.
+        """
+        texts = [str(i.get("query", "")) + " " + str(i.get("hint", "")) for i in inputs]
+        lowered = [t.lower() for t in texts]
+        signal = [min(1.0, 0.4 + 0.6 * (len(t.strip()) > 24)) for t in texts]
+        intent = [1.0 if any(w in low for w in PLAN_WORDS) else 0.2 for low in lowered]
+        urgency = [1.0 if "urgent" in low else 0.4 for low in lowered]
+
+        now = time.time()
+        return [
+            Observation(
+                timestamp=now,
+                system_id=self.system_id,
+                inputs=inp,
+                context=context or {},
+                features={"signal_quality": sq, "intent_plan": ip, "urgency": ug},
+                provenance=["π:normalized_text", "π:basic_features_v1"],
+            )
+            for inp, sq, ip, ug in zip(inputs, signal, intent, urgency)
+        ]
+
     # ---- φ-phase -------------------------------------------------------------
 
     def harmonize(self, obs: Observation) -> Dict[str, Any]:
@@ -292,9 +544,7 @@ class CIEngine:
         signal_quality = obs.features.get("signal_quality", 0.5)
         kappa = self.meter.kappa_alignment(signal_quality, reciprocity, circularity)
 
-        obligations_met = self.memory.obligations_met_ratio()
-        horizon = max([c["due_years"] for c in self.memory.commitments.values()], default=0.0)
-        tau = self.meter.tau_responsibility(horizon_years=horizon, obligations_met_ratio=obligations_met)
+        tau = self._tau()
 
         # Σ-Drift based on urgency (proxy instability), transparency, and unpriced externalities
         transparency = values.get("transparency", 0.7)
@@ -306,11 +556,7 @@ class CIEngine:
 
         outline = {
             "premise": obs.inputs.get("query", "No query given."),
-            "pillars": [
-                "Coherence-first reasoning with audit trail",
-                "Energy-aware and circular-by-default planning",
-                "Temporal duties and milestones with public check-ins",
-            ],
+            "pillars": list(self.PILLARS),
             "scores": {"kappa": kappa, "tau": tau, "sigma": sigma},
             "provenance": ["φ:values_merge", "φ:coherence_scores_v1"],
         }
@@ -331,21 +577,7 @@ class CIEngine:
         kappa = harm["scores"]["kappa"]; tau = harm["scores"]["tau"]; sigma = harm["scores"]["sigma"]
 
         # Draft content (deterministic template; systems can swap this writer).
-        draft_lines = []
-        draft_lines.append(f"Goal: {goal}")
-        draft_lines.append("")
-        draft_lines.append("Coherent plan (π→φ→e):")
-        draft_lines.append("1) Perception (π): unify inputs, clarify constraints, and surface hidden costs.")
-        draft_lines.append("2) Harmonic Integration (φ): align with reciprocity, circularity, and long-horizon duties.")
-        draft_lines.append("3) Expansion (e): produce steps, commit milestones, and open the audit trail.")
-        draft_lines.append("")
-        draft_lines.append("Pillars:")
-        for p in harm["pillars"]:
-            draft_lines.append(f"- {p}")
-        draft_lines.append("")
-        draft_lines.append(f"Scores — κ:{kappa:.2f}  τ:{tau:.2f}  Σ-Drift:{sigma:.2f}")
-
-        draft = "\n".join(draft_lines)
+        draft = self._write_draft(goal, self._draft_body(harm["pillars"]), kappa, tau, sigma)
 
         # Ethical check
         passed, notes = self.guard.check(obs, draft, (kappa, tau, sigma))
@@ -353,11 +585,7 @@ class CIEngine:
             draft += "\n\nRevision Notes:\n" + "\n".join(f"- {n}" for n in notes)
 
         # Instruments (simple functions of scores)
-        incentives = {
-            "CCE": round(100.0 * kappa * tau, 2),                 # earned credit
-            "CRB": round(20.0 * max(0.0, kappa - sigma), 2),      # rebate for integrity over risk
-            "TEB_yield_bps": round(50.0 + 450.0 * tau, 2),        # bond yield basis points tied to τ
-        }
+        incentives = self._incentives(kappa, tau, sigma)
 
         # Memory updates
         self.memory.add_episode(obs, summary=f"Produced plan for: {goal}")
@@ -377,6 +605,111 @@ class CIEngine:
             provenance=obs.provenance + harm["provenance"] + ["e:writer_v1", "e:ethics_gate"],
         )
 
+    @staticmethod
+    def _draft_body(pillars: List[str]) -> str:
+        """The goal- and score-independent middle of the e-phase draft."""
+        lines = [
+            "",
+            "Coherent plan (π→φ→e):",
+            "1) Perception (π): unify inputs, clarify constraints, and surface hidden costs.",
+            "2) Harmonic Integration (φ): align with reciprocity, circularity, and long-horizon duties.",
+            "3) Expansion (e): produce steps, commit milestones, and open the audit trail.",
+            "",
+            "Pillars:",
+        ]
+        lines.extend(f"- {p}" for p in pillars)
+        lines.append("")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _write_draft(goal: str, body: str, kappa: float, tau: float, sigma: float) -> str:
+        return f"Goal: {goal}\n{body}\nScores — κ:{kappa:.2f}  τ:{tau:.2f}  Σ-Drift:{sigma:.2f}"
+
+    @staticmethod
+    def _incentives(kappa: float, tau: float, sigma: float) -> Dict[str, float]:
+        return {
+            "CCE": round(100.0 * kappa * tau, 2),                 # earned credit
+            "CRB": round(20.0 * max(0.0, kappa - sigma), 2),      # rebate for integrity over risk
+            "TEB_yield_bps": round(50.0 + 450.0 * tau, 2),        # bond yield basis points tied to τ
+        }
+
+    # ---- Batch API -----------------------------------------------------------
+
+    def expand_many(self, goals: Sequence[str],
+                    hints: Optional[Sequence[Optional[Dict[str, Any]]]] = None
+                    ) -> Tuple[List[Action], Dict[str, List[Any]]]:
+        """
+        Batch e-phase: the same Actions, audit entries, episodes and
+        commitments as calling expand() once per goal in order, but with
+        features extracted for the whole batch (perceive_many), κ/τ/Σ
+        computed as columns, and the constant part of the draft built once.
+
+        Returns (actions, table) where table is columnar:
+        {"goal", "kappa", "tau", "sigma", "passed", "CCE", "CRB", "TEB_yield_bps"},
+        one list entry per goal.
+        """
+        goals = list(goals)
+        hints = list(hints) if hints is not None else [None] * len(goals)
+        if len(hints) != len(goals):
+            raise ValueError("hints must match goals in length")
+        count = len(goals)
+        observations = self.perceive_many(
+            [{"query": g, "hint": (h or {}).get("note", "")} for g, h in zip(goals, hints)])
+
+        # φ: engine-level terms are shared by the whole batch.
+        values = self.memory.semantic.get("values", {})
+        reciprocity = values.get("reciprocity", 0.5)
+        circularity = values.get("circularity", 0.5)
+        transparency = values.get("transparency", 0.7)
+        kappas = self.meter.kappa_alignment_many(
+            [o.features.get("signal_quality", 0.5) for o in observations], reciprocity, circularity)
+        sigmas = self.meter.sigma_drift_many(
+            [0.2 + 0.6 * o.features.get("urgency", 0.0) for o in observations],
+            1.0 - transparency, 0.5 * (1.0 - circularity))
+
+        # τ only moves when the first expand() records the default commitment,
+        # so the batch needs at most two values: before and after that point.
+        bootstrap = "default" not in self.memory.commitments
+        tau_now = self._tau()
+        if bootstrap and count:
+            self.memory.record_commitment("default", promise="Publish public milestone check-ins", due_years=5.0)
+        taus = [tau_now] + [self._tau()] * (count - 1) if bootstrap else [tau_now] * count
+
+        body = self._draft_body(list(self.PILLARS))
+        e_prov = ["φ:values_merge", "φ:coherence_scores_v1", "e:writer_v1", "e:ethics_gate"]
+        table: Dict[str, List[Any]] = {k: [] for k in
+                                       ("goal", "kappa", "tau", "sigma", "passed", "CCE", "CRB", "TEB_yield_bps")}
+        actions: List[Action] = []
+        now = time.time()
+        for goal, obs, kappa, tau, sigma in zip(goals, observations, kappas, taus, sigmas):
+            draft = self._write_draft(goal, body, kappa, tau, sigma)
+            passed, notes = self.guard.check(obs, draft, (kappa, tau, sigma))
+            if not passed:
+                draft += "\n\nRevision Notes:\n" + "\n".join(f"- {n}" for n in notes)
+            incentives = self._incentives(kappa, tau, sigma)
+            self.memory.add_episode(obs, summary=f"Produced plan for: {goal}")
+            actions.append(Action(
+                timestamp=now,
+                system_id=self.system_id,
+                content=draft,
+                score_kappa=kappa,
+                score_tau=tau,
+                sigma_drift=sigma,
+                incentives=incentives,
+                provenance=obs.provenance + e_prov,
+            ))
+            for key, val in (("goal", goal), ("kappa", kappa), ("tau", tau), ("sigma", sigma),
+                             ("passed", passed)):
+                table[key].append(val)
+            for key, val in incentives.items():
+                table[key].append(val)
+        return actions, table
+
+    def _tau(self) -> float:
+        """τ from the commitment ledger: horizon is the furthest due date."""
+        return self.meter.tau_responsibility(horizon_years=self.memory.max_due_years(),
+                                             obligations_met_ratio=self.memory.obligations_met_ratio())
+
 
 # --------- ASI Awakening Kernel ----------------------------------------------
 
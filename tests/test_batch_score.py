@@ -0,0 +1,46 @@
+import json
+
+import pytest
+from coherence_field import batch_score
+
+
+def _corpus(path):
+    lines = [json.dumps({"id": f"d{i}", "text": f"Doc {i} talks about storage. Storage helps doc {i}."}).encode()
+             for i in range(7)]
+    lines[2] = b"{not json"
+    lines[4] = b'{"id": "bad", "text": "\xff\xfe"}'  # invalid UTF-8
+    path.write_bytes(b"\n".join(lines) + b"\n")
+
+
+def _rows(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_resume_after_crash_truncates_partial_output(tmp_path, monkeypatch):
+    corpus = tmp_path / "corpus.jsonl"
+    _corpus(corpus)
+    reference = tmp_path / "reference.jsonl"
+    assert batch_score.run(str(corpus), str(reference), processes=0, shard_size=2, backend="hashing") == 7
+    expected = _rows(reference)
+    assert [r["line"] for r in expected] == list(range(1, 8))
+    assert [r["line"] for r in expected if "error" in r] == [3, 5]
+
+    out = tmp_path / "scores.jsonl"
+    real_score_shard = batch_score._score_shard
+    calls = []
+
+    def crash_on_second_shard(shard):
+        calls.append(shard)
+        if len(calls) == 2:
+            raise RuntimeError("killed")
+        return real_score_shard(shard)
+
+    monkeypatch.setattr(batch_score, "_score_shard", crash_on_second_shard)
+    with pytest.raises(RuntimeError):
+        batch_score.run(str(corpus), str(out), processes=0, shard_size=2, backend="hashing")
+    monkeypatch.setattr(batch_score, "_score_shard", real_score_shard)
+
+    with open(out, "ab") as f:
+        f.write(b'{"line": 99, "half-written')  # a shard cut off mid-write
+    assert batch_score.run(str(corpus), str(out), processes=0, shard_size=2, backend="hashing") == 7
+    assert _rows(out) == expected
@@ -0,0 +1,27 @@
+import pytest
+from coherence_field.embedding_backends import HashingNgramBackend
+from coherence_field.llm_coherence_score import LLMCoherenceScorer
+
+TEXT = ("The grid needs storage. Storage smooths the peaks. Peaks drive prices up? "
+        "Prices fall when storage grows. Bananas are yellow.")
+
+
+def test_stream_matches_score_and_emits_one_triad_per_pair():
+    scorer = LLMCoherenceScorer(backend=HashingNgramBackend())
+    stream = scorer.stream()
+    triads = []
+    for i in range(0, len(TEXT), 7):
+        triads.extend(stream.feed(TEXT[i:i + 7]))
+    # the last sentence has no following boundary yet, so it is still pending
+    assert len(stream.sentences) == 4
+    assert len(triads) == 3
+    assert all(len(t) == 3 for t in triads)
+
+    result = stream.close(ethical_keywords=["storage"])
+    expected = scorer.score(TEXT, ethical_keywords=["storage"])
+    assert result["flag"] == expected["flag"]
+    for key in ("kappa", "delta_phi", "omega", "overall"):
+        assert result[key] == pytest.approx(expected[key], abs=1e-6)
+
+    with pytest.raises(RuntimeError):
+        stream.feed("More text.")
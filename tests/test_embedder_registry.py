@@ -0,0 +1,47 @@
+import sys
+import threading
+import time
+import types
+
+import pytest
+from coherence_field import embedder_registry
+
+
+@pytest.fixture
+def fake_st(monkeypatch):
+    built = []
+
+    class SentenceTransformer:
+        def __init__(self, name, device=None):
+            time.sleep(0.02)  # widen the race window
+            built.append((name, device))
+
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = SentenceTransformer
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+    embedder_registry.unload()
+    yield built
+    embedder_registry.unload()
+
+
+def test_concurrent_get_embedder_loads_once(fake_st):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(embedder_registry.get_embedder("m", "cpu")))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert fake_st == [("m", "cpu")]
+    assert len({id(r) for r in results}) == 1
+
+
+def test_warm_up_and_unload(fake_st):
+    embedder_registry.warm_up("a", "b", device="cpu")
+    embedder_registry.get_embedder("a", "cuda")
+    assert sorted(embedder_registry.loaded()) == [("a", "cpu"), ("a", "cuda"), ("b", "cpu")]
+    assert embedder_registry.unload(device="cuda") == 1
+    assert embedder_registry.unload("a") == 1
+    assert embedder_registry.loaded() == [("b", "cpu")]
+    embedder_registry.get_embedder("a", "cpu")  # reloads after unload
+    assert fake_st.count(("a", "cpu")) == 2
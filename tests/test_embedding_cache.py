@@ -0,0 +1,54 @@
+import numpy as np
+from coherence_field.embedding_cache import EmbeddingCache
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.seen = []
+
+    def __call__(self, batch):
+        self.seen.extend(batch)
+        return np.array([[len(s), s.count("a"), 1.0] for s in batch], dtype=np.float32)
+
+
+def test_lru_tier_counts_and_evicts():
+    enc = CountingEncoder()
+    cache = EmbeddingCache(capacity=2)
+    first = cache.encode(["a", "bb", "a"], enc)
+    assert enc.seen == ["a", "bb"]
+    assert np.array_equal(first[0], first[2])
+    cache.encode(["ccc"], enc)  # evicts "a"
+    cache.encode(["a"], enc)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 4, 2)
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    enc = CountingEncoder()
+    EmbeddingCache(disk_path=str(tmp_path), disk_capacity=16).encode(["alpha", "beta"], enc)
+    other = EmbeddingCache(disk_path=str(tmp_path), disk_capacity=16)
+    out = other.encode(["beta", "alpha"], enc)
+    assert enc.seen == ["alpha", "beta"]
+    assert other.stats()["disk_hits"] == 2
+    assert out[0].tolist() == [4.0, 1.0, 1.0]
+
+
+def test_shared_cache_is_scoped_per_scorer_backend(tmp_path):
+    from coherence_field.embedding_backends import HashingNgramBackend
+    from coherence_field.llm_coherence_score import LLMCoherenceScorer
+
+    cache = EmbeddingCache(disk_path=str(tmp_path / "emb"))
+    small = LLMCoherenceScorer(cache=cache, backend=HashingNgramBackend(dim=256))
+    large = LLMCoherenceScorer(cache=cache, backend=HashingNgramBackend(dim=512))
+    sentences = ["One idea.", "Another idea."]
+    assert small._encode(sentences).shape == (2, 256)
+    assert large._encode(sentences).shape == (2, 512)
+    assert small._encode(sentences).shape == (2, 256)
+    assert cache.stats()["hits"] == 2
+
+
+def test_lru_entries_do_not_pin_the_encoder_batch():
+    cache = EmbeddingCache(capacity=3)
+    cache.encode([f"sentence {i}" for i in range(500)], CountingEncoder())
+    assert len(cache._lru) == 3
+    assert all(vec.base is None for vec in cache._lru.values())
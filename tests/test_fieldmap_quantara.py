@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from coherence_field.fieldmap_quantara import FieldConfig, QuantaraField
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(7)
+    return np.concatenate([np.full(300, 0.95), rng.uniform(-0.2, 1.2, 1000)])
+
+
+def test_run_array_matches_step(series):
+    ref, fast = QuantaraField(), QuantaraField()
+    expected = np.array(ref.run(series.tolist()))
+    trace = fast.run_array(series)
+    assert trace.shape == (len(series), 3)
+    assert np.max(np.abs(trace[:, 0] - expected[:, 0])) < 1e-12
+    assert np.array_equal(trace[:, 1:], expected[:, 1:])
+    assert fast.state.t == ref.state.t
+    assert fast.state.kappa == pytest.approx(ref.state.kappa, abs=1e-12)
+
+
+def test_run_array_continues_from_state(series):
+    cfg = FieldConfig(ema_alpha=0.5)
+    ref, fast = QuantaraField(cfg), QuantaraField(cfg)
+    ref.run(series.tolist())
+    fast.run_array(series[:400])
+    fast.run_array(series[400:])
+    assert fast.state.t == ref.state.t
+    assert fast.state.kappa == pytest.approx(ref.state.kappa, abs=1e-12)
+
+
+def test_run_array_sanitises_nan_like_step():
+    series = [0.4, float("nan"), 0.7, float("inf"), -float("inf")]
+    ref, fast = QuantaraField(), QuantaraField()
+    expected = np.array(ref.run(series))
+    trace = fast.run_array(series)
+    assert not np.isnan(trace).any()
+    assert np.max(np.abs(trace[:, 0] - expected[:, 0])) < 1e-12
+    assert np.array_equal(trace[:, 1:], expected[:, 1:])
+    assert fast.step(0.5) == pytest.approx(ref.step(0.5), abs=1e-12)
+
+
+def test_run_array_empty():
+    field = QuantaraField()
+    assert field.run_array([]).shape == (0, 3)
+    assert field.state.t == 0
+
+
+def test_field_bank_matches_individual_fields():
+    from coherence_field.field_bank import FieldBank
+
+    rng = np.random.default_rng(3)
+    configs = [FieldConfig(ema_alpha=a, gain_rate=g) for a, g in rng.uniform(0.05, 0.9, (8, 2))]
+    fields = [QuantaraField(c) for c in configs]
+    bank = FieldBank.from_configs(configs)
+    for row in rng.uniform(0.0, 1.0, (50, 8)):
+        bank.step(row)
+        triads = np.array([f.step(x) for f, x in zip(fields, row)])
+    assert np.array_equal(bank.kappa, triads[:, 0])
+    assert np.array_equal(bank.delta_phi, triads[:, 1])
+    assert np.array_equal(bank.omega, triads[:, 2])
+    assert bank.kappa_eq == pytest.approx(np.mean(triads[:, 2] - triads[:, 1]))
+    assert np.array_equal(bank.stable, triads[:, 1] <= triads[:, 2])
+    assert bank.state(0) == fields[0].state
+
+
+def test_run_compressed_fast_forwards_constant_spans():
+    from coherence_field.fieldmap_quantara import encode_runs
+
+    series = [0.95] * 5000 + [0.6, 0.55] + [0.3] * 2000 + [1.5, 2.0] + [0.8]
+    ref, fast = QuantaraField(), QuantaraField()
+    ref.run(series)
+    values, counts = encode_runs(series)
+    assert counts.tolist() == [5000, 1, 1, 2000, 2, 1]
+    ends = fast.run_compressed(series)
+    assert ends.shape == (6, 3)
+    assert fast.state.t == ref.state.t
+    assert fast.state.kappa == pytest.approx(ref.state.kappa, abs=1e-12)
+    assert (fast.state.delta_phi, fast.state.omega) == (ref.state.delta_phi, ref.state.omega)
@@ -0,0 +1,24 @@
+import random
+from coherence_field.keyword_matcher import KeywordMatcher, compile_keywords
+
+
+def _reference_hits(sentences, keywords):
+    return sum(1 for s in sentences if any(kw.lower() in s.lower() for kw in keywords))
+
+
+def test_sentence_hits_match_substring_semantics():
+    rng = random.Random(5)
+    words = ["ethic", "ethical", "Coherence", "drift", "care", "careful", "sky"]
+    keywords = ["ethic", "ETHICAL", "coherence", "care"]
+    for _ in range(200):
+        sentences = [" ".join(rng.choices(words, k=rng.randint(0, 4))) for _ in range(rng.randint(0, 6))]
+        assert KeywordMatcher(keywords).sentence_hits(sentences) == _reference_hits(sentences, keywords)
+
+
+def test_keyword_counts_include_overlapping_prefixes():
+    counts = KeywordMatcher(["ethic", "ethical", "cal"]).keyword_counts(["Ethical care.", "ethics"])
+    assert counts == {"ethical": 1, "ethic": 2, "cal": 1}
+
+
+def test_compile_keywords_is_cached():
+    assert compile_keywords(["a", "b"]) is compile_keywords(("a", "b"))
@@ -1,10 +1,18 @@
+import numpy as np
 import pytest
-from coherence_field.llm_coherence_scorer import LLMCoherenceScorer
+from coherence_field.llm_coherence_score import LLMCoherenceScorer, signal_series
+from coherence_field.embedding_backends import HashingNgramBackend
 
 @pytest.fixture
 def scorer():
+    # the threshold tests below are calibrated on MiniLM embeddings
+    pytest.importorskip("sentence_transformers")
     return LLMCoherenceScorer()
 
+@pytest.fixture
+def hashing_scorer():
+    return LLMCoherenceScorer(backend=HashingNgramBackend())
+
 def test_high_coherence(scorer):
     text = "Sentence one flows. Sentence two connects well. Sentence three aligns."
     result = scorer.score(text)
@@ -21,3 +29,46 @@ def test_ethical_bonus_and_flag(scorer):
     text = "AI should be ethical. Coherence is key."
     with_bonus = scorer.score(text, ethical_keywords=['ethical', 'coherence'])
     assert 'ETHICAL_DRIFT' not in with_bonus['flag']  # Bonus avoids drift flag
+
+def test_score_many_matches_score(hashing_scorer):
+    scorer = hashing_scorer
+    texts = ["Sentence one flows. Sentence two connects well.", "Single sentence.", "Random idea. Sudden drift."]
+    batched = scorer.score_many(texts, ethical_keywords=['sentence'], max_sentences=3)
+    for text, result in zip(texts, batched):
+        single = scorer.score(text, ethical_keywords=['sentence'])
+        assert result['flag'] == single['flag']
+        assert abs(result['overall'] - single['overall']) < 1e-6
+
+@pytest.mark.parametrize("mode", ["consecutive", "lag", "window", "centroid"])
+def test_scoring_modes(hashing_scorer, mode):
+    scorer = hashing_scorer
+    text = "Sentence one flows. Sentence two connects well. Sentence three aligns. Sentence four closes."
+    result = scorer.score(text, mode=mode, lag=2, window=2)
+    assert 0.0 <= result['overall'] <= 1.0
+    assert result['flag'].startswith(('OK', 'LOW_COH'))
+
+
+def _naive_cos(a, b):
+    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+def test_signal_series_matches_naive_loops():
+    rng = np.random.default_rng(0)
+    emb = rng.random((6, 4))
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    n = len(emb)
+
+    lag = [_naive_cos(emb[i], emb[i - 2]) for i in range(2, n)]
+    np.testing.assert_allclose(signal_series(emb, 'lag', lag=2), lag, atol=1e-12)
+    consecutive = [_naive_cos(emb[i], emb[i - 1]) for i in range(1, n)]
+    np.testing.assert_allclose(signal_series(emb, 'consecutive'), consecutive, atol=1e-12)
+    window = [_naive_cos(emb[i], emb[max(0, i - 3):i].mean(axis=0)) for i in range(1, n)]
+    np.testing.assert_allclose(signal_series(emb, 'window', window=3), window, atol=1e-12)
+    centroid = [_naive_cos(emb[i], emb.mean(axis=0)) for i in range(n)]
+    np.testing.assert_allclose(signal_series(emb, 'centroid'), centroid, atol=1e-12)
+
+def test_signal_series_clips_and_handles_short_docs():
+    emb = np.array([[1.0, 0.0], [-1.0, 0.0]])
+    assert signal_series(emb, 'lag').tolist() == [0.0]
+    assert signal_series(emb[:1], 'window').tolist() == [1.0]
+    with pytest.raises(ValueError):
+        signal_series(emb, 'bogus')
@@ -0,0 +1,350 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from apps.metacog import metacog_app
+
+
+@pytest.fixture
+def client():
+    with TestClient(metacog_app.app) as c:
+        yield c
+
+
+def test_lifespan_opens_and_closes_upstream_client():
+    with TestClient(metacog_app.app):
+        assert metacog_app.HTTP._client is not None
+    assert metacog_app.HTTP._client is None
+
+
+def test_chat_reports_upstream_calls(client):
+    r = client.post("/chat", json={"messages": [{"role": "user", "content": "Hello"}]})
+    assert r.status_code == 200
+    calls = r.json()["state"]["upstream_calls"]
+    assert [c["phase"] for c in calls][:3] == ["pi", "phi", "e"]
+    assert all(c["ms"] >= 0 for c in calls)
+
+
+def test_chat_stream_emits_tokens_then_done(client):
+    body = {"session_id": "s-stream", "messages": [{"role": "user", "content": "Hello there"}]}
+    with client.stream("POST", "/chat/stream", json=body) as r:
+        assert r.headers["content-type"].startswith("text/event-stream")
+        events = [line[len("event: "):] for line in r.iter_lines() if line.startswith("event: ")]
+    assert events[0] == "session" and events[-1] == "done"
+    assert events.count("token") > 1
+    assert client.get("/state/s-stream").json()["messages"][-1]["role"] == "assistant"
+
+
+def test_phase_cache_serves_repeated_pi(client, monkeypatch):
+    monkeypatch.setattr(metacog_app, "PHASE_CACHE", metacog_app.PhaseCache(ttl=60, max_entries=4))
+    body = {"messages": [{"role": "user", "content": "What is coherence?"}]}
+    first = client.post("/chat", json=body).json()["state"]["phase_cache"]
+    second = client.post("/chat", json=body).json()["state"]["phase_cache"]
+    assert first == {"hits": 0, "misses": 2}
+    assert second == {"hits": 2, "misses": 0}
+
+
+def test_best_of_n_reflection_cancels_after_target(monkeypatch):
+    import asyncio
+
+    class SlowAdapter(metacog_app.UpstreamAdapter):
+        def __init__(self):
+            self.n = 0
+        async def complete(self, messages, **kw):
+            self.n += 1
+            n = self.n
+            await asyncio.sleep(0.01 * n)
+            return "good" if n == 1 else "bad"
+
+    monkeypatch.setattr(metacog_app, "ADAPTER", SlowAdapter())
+    monkeypatch.setattr(metacog_app, "score_text", lambda text: {"good": 0.9}.get(text, 0.1))
+    policy = metacog_app.Policy(reflection_mode="best_of_n", reflection_candidates=4, max_reflections=4)
+    calls = []
+    metacog_app._UPSTREAM_CALLS.set(calls)
+    out, coh, nref = asyncio.run(metacog_app._reflect("draft", policy))
+    assert (out, coh, nref) == ("good", 0.9, 1)
+    assert sum(1 for c in calls if c.get("cancelled")) == 3
+
+
+def test_bounded_memory_evicts_and_caps():
+    store = metacog_app.BoundedMemory(max_sessions=2, idle_ttl=3600, max_messages=3)
+    store.append_messages("a", [{"role": "user", "content": str(i)} for i in range(5)])
+    assert [m["content"] for m in store.get("a")["messages"]] == ["2", "3", "4"]
+    store.get("b")
+    store.get("c")
+    assert list(store.sessions) == ["b", "c"]
+
+
+def test_bounded_memory_is_safe_across_threads():
+    import sys
+    import threading
+
+    store = metacog_app.BoundedMemory(max_sessions=4, idle_ttl=3600, max_messages=3)
+    errors = []
+
+    def hammer(n):
+        try:
+            for i in range(2000):
+                sid = f"s{(n * 7 + i) % 16}"
+                if i % 3 == 0:
+                    store.set(sid, metacog_app._new_session())
+                elif i % 3 == 1:
+                    store.append_messages(sid, [{"role": "user", "content": str(i)}])
+                else:
+                    store.update_stats(sid, {"i": i})
+        except Exception as exc:
+            errors.append(exc)
+
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=hammer, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(switch)
+    assert errors == []
+    assert set(store.sessions) == set(store.last_seen)
+    assert len(store.sessions) <= 4
+
+
+def test_sqlite_memory_persists_incrementally(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    store = metacog_app.SQLiteMemory(path)
+    store.append_messages("s", [{"role": "user", "content": "hi"}])
+    store.append_messages("s", [{"role": "assistant", "content": "hello"}])
+    store.update_stats("s", {"last_coherence": 0.7})
+    reopened = metacog_app.SQLiteMemory(path, max_messages=1)
+    ses = reopened.get("s")
+    assert ses["messages"] == [{"role": "assistant", "content": "hello"}]
+    assert ses["stats"] == {"last_coherence": 0.7}
+
+
+def test_context_builder_bounds_prompt_and_reuses_summary():
+    builder = metacog_app.ContextBuilder(summary_tokens=1000)
+    state = {}
+    messages = [{"role": "user", "content": f"Turn {i}. " + "x" * 200} for i in range(20)]
+    ctx = builder.build(messages, budget_tokens=200, state=state)
+    assert "Turn 19." in ctx and "x" * 200 + "\nuser: Turn 0." not in ctx
+    assert len(state["summary"]) == 17 and state["summary"][0].startswith("- user: Turn 0")
+    messages.append({"role": "assistant", "content": "Turn 20. " + "y" * 200})
+    builder.build(messages, budget_tokens=200, state=state)
+    assert len(state["summary"]) == 18 and state["summary"][-1].startswith("- user: Turn 17")
+
+
+def test_chat_batch_streams_every_result(client):
+    body = {"concurrency": 3,
+            "requests": [{"messages": [{"role": "user", "content": f"q{i}"}]} for i in range(7)]}
+    r = client.post("/chat/batch", json=body)
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    items = [json.loads(line) for line in r.text.splitlines()]
+    assert sorted(i["index"] for i in items) == list(range(7))
+    assert all(i["ok"] for i in items)
+
+
+def test_token_bucket_spaces_out_calls():
+    import asyncio, time
+
+    async def main():
+        bucket = metacog_app.TokenBucket(rate=100.0, burst=1)
+        t0 = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - t0
+
+    assert asyncio.run(main()) >= 0.045
+
+
+def test_metrics_endpoint_reports_stages(client):
+    client.post("/chat", json={"messages": [{"role": "user", "content": "Hello"}]})
+    text = client.get("/metrics").text
+    assert 'metacog_stage_seconds_count{stage="pi"}' in text
+    assert 'metacog_upstream_seconds_bucket{phase="e",le="+Inf"}' in text
+    assert "metacog_in_flight 0.0" in text
+    assert "metacog_coherence_count" in text
+
+
+def test_identical_inflight_calls_share_one_upstream_request(monkeypatch):
+    import asyncio
+
+    class CountingAdapter(metacog_app.UpstreamAdapter):
+        def __init__(self):
+            self.n = 0
+        async def complete(self, messages, **kw):
+            self.n += 1
+            await asyncio.sleep(0.02)
+            return "pi-out"
+
+    adapter = CountingAdapter()
+    monkeypatch.setattr(metacog_app, "ADAPTER", adapter)
+    monkeypatch.setattr(metacog_app, "COALESCE", metacog_app.SingleFlight())
+    prompt = metacog_app._mk_pi_prompt("Hello")
+
+    async def scenario():
+        policy = metacog_app.Policy()
+        tasks = [asyncio.ensure_future(metacog_app._complete("pi", prompt, policy)) for _ in range(5)]
+        await asyncio.sleep(0.005)
+        tasks[0].cancel()  # the leader's caller walks away; the shared call must survive
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1:] == ["pi-out"] * 4
+    assert adapter.n == 1
+    assert metacog_app.COALESCE.flights == {}
+
+
+def test_phase_cache_purges_expired_rows_periodically(tmp_path):
+    import asyncio
+
+    cache = metacog_app.PhaseCache(ttl=-1, path=str(tmp_path / "pc.sqlite3"), purge_every=3)
+    plan = cache.db.execute("EXPLAIN QUERY PLAN DELETE FROM phase_cache WHERE expires < 0").fetchall()
+    assert any("phase_cache_expires" in row[-1] for row in plan)
+    count = lambda: cache.db.execute("SELECT COUNT(*) FROM phase_cache").fetchone()[0]
+    asyncio.run(cache.put("a", "1"))
+    asyncio.run(cache.put("b", "2"))
+    assert count() == 2  # expired, but not purged on every write
+    asyncio.run(cache.put("c", "3"))
+    assert count() == 0
+    assert asyncio.run(cache.get("a")) is None
+
+
+def test_phase_cache_disk_io_runs_off_the_event_loop(tmp_path, monkeypatch):
+    import asyncio
+    import threading
+
+    cache = metacog_app.PhaseCache(ttl=60, max_entries=1, path=str(tmp_path / "pc.sqlite3"))
+    threads = []
+    for name in ("_disk_get", "_disk_put"):
+        real = getattr(cache, name)
+        def spy(*args, _real=real):
+            threads.append(threading.get_ident())
+            return _real(*args)
+        monkeypatch.setattr(cache, name, spy)
+
+    async def scenario():
+        await cache.put("a", "1")
+        await cache.put("b", "2")  # evicts "a" from the memory tier
+        b = await cache.get("b")
+        return threading.get_ident(), await cache.get("a"), b
+
+    loop_thread, a, b = asyncio.run(scenario())
+    assert (a, b) == ("1", "2")
+    assert len(threads) == 3  # two puts and the one memory miss; "b" is served inline
+    assert loop_thread not in threads
+
+
+def test_best_of_n_respects_max_reflections(monkeypatch):
+    import asyncio
+
+    class CountingAdapter(metacog_app.UpstreamAdapter):
+        def __init__(self):
+            self.n = 0
+        async def complete(self, messages, **kw):
+            self.n += 1
+            return "bad"
+
+    adapter = CountingAdapter()
+    monkeypatch.setattr(metacog_app, "ADAPTER", adapter)
+    monkeypatch.setattr(metacog_app, "score_text", lambda text: 0.1)
+    off = metacog_app.Policy(reflection_mode="best_of_n", reflection_candidates=4, max_reflections=0)
+    assert asyncio.run(metacog_app._reflect("draft", off)) == ("draft", 0.1, 0)
+    assert adapter.n == 0
+    capped = metacog_app.Policy(reflection_mode="best_of_n", reflection_candidates=4, max_reflections=2)
+    asyncio.run(metacog_app._reflect("draft", capped))
+    assert adapter.n == 2
+
+
+def test_sqlite_store_runs_off_the_event_loop(tmp_path, monkeypatch):
+    import threading
+
+    threads = {"store": set(), "loop": set()}
+
+    class RecordingStore(metacog_app.SQLiteMemory):
+        def append_messages(self, sid, messages):
+            threads["store"].add(threading.get_ident())
+            return super().append_messages(sid, messages)
+
+    class LoopAdapter(metacog_app.EchoAdapter):
+        async def complete(self, messages, **kw):
+            threads["loop"].add(threading.get_ident())
+            return await super().complete(messages, **kw)
+
+    monkeypatch.setattr(metacog_app, "MEM", RecordingStore(str(tmp_path / "s.sqlite3")))
+    monkeypatch.setattr(metacog_app, "ADAPTER", LoopAdapter())
+    with TestClient(metacog_app.app) as c:
+        r = c.post("/chat", json={"session_id": "s", "messages": [{"role": "user", "content": "Hi"}]})
+        assert r.status_code == 200
+        assert c.get("/state/s").json()["messages"][-1]["role"] == "assistant"
+    assert threads["store"] and threads["loop"]
+    assert not threads["store"] & threads["loop"]
+
+
+def test_context_builder_tracks_eviction_by_position_with_duplicate_turns():
+    builder = metacog_app.ContextBuilder(summary_tokens=10_000)
+    store = metacog_app.BoundedMemory(max_messages=6)
+    state = {}
+    for i in range(7):
+        ses = store.append_messages("s", [{"role": "user", "content": "ok"}])
+        builder.build(ses["messages"], budget_tokens=12, state=state, offset=ses["offset"])
+        store.append_messages("s", [{"role": "assistant", "content": f"answer {i} " + "z" * 20}])
+    ses = store.get("s")
+    ctx = builder.build(ses["messages"], budget_tokens=12, state=state, offset=ses["offset"])
+    lines = state["summary"]
+    # every evicted turn is summarized exactly once, in order, despite identical "ok" turns
+    assert lines == [line for i in range(7) for line in ("- user: ok", f"- assistant: answer {i} " + "z" * 20)][:len(lines)]
+    assert state["summarized"] == len(lines)
+    assert "answer 6" in ctx
+
+
+def test_run_batch_clamps_concurrency(monkeypatch):
+    import asyncio
+
+    spawned = []
+    real_create_task = asyncio.create_task
+    monkeypatch.setattr(metacog_app.asyncio, "create_task",
+                        lambda coro: spawned.append(1) or real_create_task(coro))
+    monkeypatch.setenv("BATCH_CONCURRENCY_MAX", "4")
+    req = metacog_app.ChatRequest(messages=[{"role": "user", "content": "Hi"}])
+
+    async def collect(requests, concurrency):
+        return [item async for item in metacog_app.run_batch(requests, concurrency)]
+
+    assert len(asyncio.run(collect([req], 10_000_000))) == 1
+    assert len(spawned) == 1
+    spawned.clear()
+    assert len(asyncio.run(collect([req] * 10, 10_000_000))) == 10
+    assert len(spawned) == 4
+
+
+def test_caller_after_abandoned_flight_starts_fresh(monkeypatch):
+    import asyncio
+
+    class SlowAdapter(metacog_app.UpstreamAdapter):
+        def __init__(self):
+            self.n = 0
+        async def complete(self, messages, **kw):
+            self.n += 1
+            try:
+                await asyncio.sleep(0.02)
+            except asyncio.CancelledError:
+                await asyncio.sleep(0.01)  # slow unwind widens the window
+                raise
+            return "pi-out"
+
+    adapter = SlowAdapter()
+    monkeypatch.setattr(metacog_app, "ADAPTER", adapter)
+    monkeypatch.setattr(metacog_app, "COALESCE", metacog_app.SingleFlight())
+    prompt = metacog_app._mk_pi_prompt("Hello")
+
+    async def scenario():
+        policy = metacog_app.Policy()
+        leader = asyncio.ensure_future(metacog_app._complete("pi", prompt, policy))
+        await asyncio.sleep(0.005)
+        leader.cancel()  # last waiter leaves: the shared call is cancelled
+        await asyncio.sleep(0)
+        return await metacog_app._complete("pi", prompt, policy)
+
+    assert asyncio.run(scenario()) == "pi-out"
+    assert adapter.n == 2
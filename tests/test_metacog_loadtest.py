@@ -0,0 +1,48 @@
+import asyncio
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from apps.metacog import loadtest, metacog_app, mock_upstream
+
+
+def test_mock_upstream_speaks_openai_protocol():
+    app = mock_upstream.create_app(mock_upstream.MockConfig(latency="fixed:0", token_delay_ms=0, reply_words=4))
+    with TestClient(app) as c:
+        body = {"model": "m", "messages": [{"role": "user", "content": "hi there"}]}
+        r = c.post("/v1/chat/completions", json=body)
+        assert r.json()["choices"][0]["message"]["content"] == "(mock) hi there hi"
+        with c.stream("POST", "/v1/chat/completions", json={**body, "stream": True}) as s:
+            lines = [l for l in s.iter_lines() if l.startswith("data:")]
+        assert lines[-1] == "data: [DONE]"
+
+
+def test_mock_upstream_error_rate_and_latency_specs():
+    app = mock_upstream.create_app(mock_upstream.MockConfig(latency="fixed:0", error_rate=1.0, error_status=503))
+    with TestClient(app) as c:
+        assert c.post("/v1/chat/completions", json={"messages": []}).status_code == 503
+        assert c.get("/stats").json()["errors"] == 1
+    with pytest.raises(ValueError):
+        mock_upstream.parse_latency("gamma:1")
+
+
+def test_percentile_nearest_rank():
+    vals = list(range(1, 101))
+    assert loadtest.percentile(vals, 50) == 50
+    assert loadtest.percentile(vals, 99) == 99
+    assert loadtest.percentile([], 95) == 0.0
+
+
+def test_loadtest_through_proxy_to_mock(monkeypatch):
+    mock = mock_upstream.create_app(mock_upstream.MockConfig(latency="uniform:1,5", token_delay_ms=0, seed=7))
+    monkeypatch.setenv("OPENAI_API_KEY", "mock")
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://mock/v1")
+    monkeypatch.setattr(metacog_app, "ADAPTER", metacog_app.OpenAIAdapter())
+    monkeypatch.setattr(metacog_app, "HTTP", metacog_app.UpstreamHTTP())
+    metacog_app.HTTP._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=mock))
+
+    report = asyncio.run(loadtest.run_load("http://proxy", concurrency=4, requests=12,
+                                           transport=httpx.ASGITransport(app=metacog_app.app)))
+    assert report["ok"] == 12 and report["errors"] == 0
+    assert {"pi", "phi", "e"} <= set(report["phases_ms"])
+    assert report["phases_ms"]["pi"]["count"] == 12
+    assert mock.state.stats["requests"] >= 36
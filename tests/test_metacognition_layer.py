@@ -0,0 +1,104 @@
+import pytest
+from metacognition_layer import CIEngine
+
+GOALS = [
+    "Plan a microgrid rollout",
+    "urgent: patch it",
+    "Write a poem",
+    "Design a phased CI rollout for public utilities",
+    "Deploy the roadmap, urgent review needed before invest",
+]
+HINTS = [None, {"note": "ops"}, {}, {"note": "region PT"}, None]
+
+
+def _fields(action):
+    return (action.content, action.score_kappa, action.score_tau, action.sigma_drift,
+            action.incentives, action.provenance)
+
+
+@pytest.mark.parametrize("seed_ledger", [False, True])
+def test_expand_many_matches_scalar_expand(seed_ledger):
+    scalar, batch = CIEngine(), CIEngine()
+    if seed_ledger:
+        for eng in (scalar, batch):
+            eng.memory.record_commitment("launch_q1", "Publish CI demo results", due_years=3.0)
+            eng.memory.update_commitment("launch_q1", kept_ratio=0.6)
+
+    expected = [scalar.expand(g, h) for g, h in zip(GOALS, HINTS)]
+    actions, table = batch.expand_many(GOALS, HINTS)
+
+    assert [_fields(a) for a in actions] == [_fields(a) for a in expected]
+    assert table["goal"] == GOALS
+    assert table["tau"] == [a.score_tau for a in expected]
+    assert table["CCE"] == [a.incentives["CCE"] for a in expected]
+    assert [e["decision"] for e in batch.guard.audit_log] == [e["decision"] for e in scalar.guard.audit_log]
+    assert len(batch.memory.episodic) == len(GOALS)
+    assert batch.memory.commitments.keys() == scalar.memory.commitments.keys()
+
+
+def test_perceive_many_matches_perceive():
+    eng = CIEngine()
+    inputs = [{"query": g, "hint": "h"} for g in GOALS]
+    assert [o.features for o in eng.perceive_many(inputs)] == [eng.perceive(i).features for i in inputs]
+
+
+def test_commitment_aggregates_track_ledger():
+    import random
+    from metacognition_layer import Memory
+
+    rng = random.Random(3)
+    mem = Memory()
+    for step in range(2000):
+        cid = f"c{rng.randrange(300)}"
+        if rng.random() < 0.5:
+            mem.record_commitment(cid, "p", due_years=round(rng.uniform(0, 40), 1))
+        else:
+            mem.update_commitment(cid, rng.random())
+        if step % 97 == 0 and mem.commitments:
+            ledger = mem.commitments.values()
+            assert mem.obligations_met_ratio() == pytest.approx(sum(c["kept"] for c in ledger) / len(ledger))
+            assert mem.max_due_years() == max(c["due_years"] for c in ledger)
+            due = mem.due_within(10.0)
+            assert set(due) == {k for k, c in mem.commitments.items() if c["due_years"] <= 10.0}
+            assert [mem.commitments[k]["due_years"] for k in due] == sorted(mem.commitments[k]["due_years"] for k in due)
+
+
+def test_due_index_is_keyed_on_due_and_id():
+    from metacognition_layer import Memory
+
+    mem = Memory()
+    for i in range(500):
+        mem.record_commitment(f"c{i}", "p", due_years=5.0)
+    for i in range(0, 500, 7):
+        mem.record_commitment(f"c{i}", "p", due_years=5.0 if i % 2 else 2.5)
+    index = list(zip(mem._due_years, mem._due_ids))
+    assert index == sorted((c["due_years"], k) for k, c in mem.commitments.items())
+
+
+def test_episodic_store_is_bounded_and_compacts():
+    from metacognition_layer import EpisodicStore
+
+    store = EpisodicStore(capacity=8, compact_batch=4)
+    for i in range(20):
+        store.append(float(i), {"urgency": float(i % 2), "signal_quality": 0.5}, f"ep{i}")
+    assert len(store) <= 8
+    assert store[-1] == {"t": 19.0, "features": {"urgency": 1.0, "signal_quality": 0.5}, "summary": "ep19"}
+    assert [e["summary"] for e in store] == [f"ep{i}" for i in range(20 - len(store), 20)]
+    assert store[1:3] == list(store)[1:3]
+    digest = store.summary()
+    assert digest["episodes"] + len(store) == 20
+    assert digest["t_first"] == 0.0 and digest["features"]["signal_quality"]["mean"] == 0.5
+
+
+def test_engine_memory_stays_flat():
+    exported = []
+    eng = CIEngine(episodic_capacity=16, audit_capacity=8, audit_export=exported.extend)
+    eng.expand_many([f"Plan step {i}" for i in range(100)])
+    assert len(eng.memory.episodic) <= 16
+    assert eng.memory.semantic["episodic_history"]["episodes"] + len(eng.memory.episodic) == 100
+    assert eng.memory.episodic[-1]["summary"] == "Produced plan for: Plan step 99"
+    assert "values" in eng.memory.semantic
+    assert len(eng.guard.audit_log) <= 8
+    assert len(exported) == eng.guard.audit_exported
+    assert len(exported) + len(eng.guard.audit_log) == 100
+    assert eng.guard.drain_audit() and eng.guard.audit_log == []
@@ -0,0 +1,78 @@
+import gzip
+import json
+import pytest
+from coherence_field.fieldmap_quantara import QuantaraField
+from coherence_field.telemetry_sink import JsonlSink
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_field_log_is_buffered_until_close(tmp_path, background):
+    log = tmp_path / "trace.jsonl"
+    sink = JsonlSink(str(log), flush_records=100, flush_interval=60, background=background)
+    with QuantaraField(sink=sink) as field:
+        field.run([0.9] * 10)
+        assert log.read_text() == ""
+    rows = _read(log)
+    assert [r["t"] for r in rows] == list(range(1, 11))
+
+
+def test_sink_rotates_and_compresses(tmp_path):
+    log = tmp_path / "trace.jsonl"
+    with JsonlSink(str(log), flush_records=10, max_bytes=500, compress=True) as sink:
+        for i in range(100):
+            sink.write({"i": i})
+    segments = sorted(tmp_path.glob("trace.*.jsonl.gz"))
+    assert segments
+    seen = []
+    for seg in segments:
+        seen += [json.loads(l)["i"] for l in gzip.open(seg, "rt").read().splitlines()]
+    seen += [r["i"] for r in _read(log)]
+    assert seen == list(range(100))
+
+
+def test_dropped_sink_is_flushed_and_released(tmp_path):
+    import gc
+    import weakref
+
+    log = tmp_path / "trace.jsonl"
+    field = QuantaraField(log_path=str(log))
+    field.run([0.9] * 5)
+    ref = weakref.ref(field._sink)
+    del field
+    gc.collect()
+    assert ref() is None
+    assert [r["t"] for r in _read(log)] == list(range(1, 6))
+
+
+def test_background_write_failure_is_reported_not_hung(tmp_path):
+    log = tmp_path / "trace.jsonl"
+    sink = JsonlSink(str(log), flush_records=1, background=True)
+    real = sink._writer.write_batch
+    calls = []
+
+    def flaky(batch):
+        calls.append(batch)
+        if len(calls) == 1:
+            raise OSError(28, "No space left on device")
+        real(batch)
+
+    sink._writer.write_batch = flaky
+    sink.write({"i": 0})
+    with pytest.raises(OSError, match="No space left"):
+        sink.flush()
+    sink.write({"i": 1})
+    sink.flush()
+    assert sink._thread.is_alive()
+    sink.close()
+    assert [r["i"] for r in _read(log)] == [1]
+
+
+def test_write_after_close_is_rejected(tmp_path):
+    with QuantaraField(log_path=str(tmp_path / "trace.jsonl")) as field:
+        field.step(0.9)
+    with pytest.raises(ValueError, match="closed"):
+        field.step(0.9)